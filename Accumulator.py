@@ -0,0 +1,177 @@
+"""
+running statistics over streams of measures in constant memory
+
+    accumulator = MeasureAccumulator("kPa", window=1000)
+    for reading in readings:
+        accumulator += reading
+    accumulator.mean # a Measure
+
+sums are compensated (Neumaier), the mean and variance are updated online
+(Welford), and nothing but floats is allocated per sample
+"""
+from Measure import Measure, readUnit
+from collections import deque
+from math import inf, sqrt
+from numbers import Integral
+
+class MeasureAccumulator:
+    """
+    the count, sum, mean, variance, minimum and maximum of the measures added
+    with a window, only the last window measures are counted
+    """
+    def __init__(self, unit, window=None):
+        """
+        unit :: String -- the unit of the numbers given to addValue, which sets the dimension
+        window :: Int -- how many of the latest measures to keep statistics over (all if None)
+        """
+        if window is not None and (not isinstance(window, Integral) or window < 1):
+            raise ValueError("the window must be a positive number of measures, not {!r}".format(window))
+        (self.multiplier, self.dimension) = readUnit(unit)
+        self.unit = unit
+        self.window = window
+        self.reset()
+    
+    def reset(self):
+        self.count = 0
+        self.sum = 0.0
+        self.compensation = 0.0 # the low-order bits lost by sum
+        self.runningMean = 0.0
+        self.squares = 0.0 # the sum of squared differences from the mean
+        if self.window is None:
+            (self.low, self.high) = (inf, -inf)
+        else:
+            self.values = deque() # the values in the window
+            self.added = 0 # how many values were ever added, to number them
+            self.lows = deque() # [(number, value)] with increasing values, the first is the minimum
+            self.highs = deque() # [(number, value)] with decreasing values, the first is the maximum
+    
+    def add(self, measure):
+        """
+        adds a measure
+        raises ValueError if it is not in the dimension of the accumulator
+        """
+        if measure.dimension is not self.dimension:
+            raise ValueError("cannot accumulate [{}] in [{}]".format(measure.dimension, self.dimension))
+        self.addBase(measure.value)
+    
+    def __iadd__(self, measure):
+        self.add(measure)
+        return self
+    
+    def addValue(self, value):
+        """
+        adds a number in the unit of the accumulator
+        """
+        self.addBase(value * self.multiplier)
+    
+    def addMany(self, measures):
+        for measure in measures:
+            self.add(measure)
+    
+    def addBase(self, value):
+        """
+        adds a number in base units
+        """
+        if self.window is not None:
+            if len(self.values) == self.window:
+                self.remove(self.values.popleft())
+            self.values.append(value)
+            self.track(value)
+        self.count += 1
+        self.accumulate(value)
+        delta = value - self.runningMean
+        self.runningMean += delta / self.count
+        self.squares += delta * (value - self.runningMean)
+        if self.window is None:
+            if value < self.low:
+                self.low = value
+            if value > self.high:
+                self.high = value
+    
+    def remove(self, value):
+        """
+        takes the oldest value of the window out of the sums
+        """
+        self.count -= 1
+        self.accumulate(-value)
+        if self.count == 0:
+            (self.runningMean, self.squares) = (0.0, 0.0)
+        else:
+            delta = value - self.runningMean
+            self.runningMean -= delta / self.count
+            self.squares = max(self.squares - delta * (value - self.runningMean), 0.0)
+        expired = self.added - self.window # the number of the value leaving
+        if self.lows[0][0] == expired:
+            self.lows.popleft()
+        if self.highs[0][0] == expired:
+            self.highs.popleft()
+    
+    def track(self, value):
+        """
+        keeps the minimum and maximum of the window in monotonic queues
+        """
+        number = self.added
+        self.added += 1
+        while self.lows and self.lows[-1][1] >= value:
+            self.lows.pop()
+        self.lows.append((number, value))
+        while self.highs and self.highs[-1][1] <= value:
+            self.highs.pop()
+        self.highs.append((number, value))
+    
+    def accumulate(self, value):
+        # Neumaier's variant of Kahan summation
+        total = self.sum + value
+        if abs(self.sum) >= abs(value):
+            self.compensation += (self.sum - total) + value
+        else:
+            self.compensation += (value - total) + self.sum
+        self.sum = total
+    
+    def __len__(self):
+        return self.count
+    
+    @property
+    def total(self):
+        return Measure.fromBase(self.sum + self.compensation, self.dimension)
+    
+    @property
+    def mean(self):
+        """
+        raises ValueError if nothing was added
+        """
+        self.requireValues()
+        return Measure.fromBase(self.runningMean, self.dimension)
+    
+    @property
+    def variance(self):
+        """
+        the sample variance, 0 for a single measure
+        raises ValueError if nothing was added
+        """
+        self.requireValues()
+        return Measure.fromBase(self.squares / (self.count - 1) if self.count > 1 else 0.0, self.dimension ** 2)
+    
+    @property
+    def std(self):
+        self.requireValues()
+        return Measure.fromBase(sqrt(self.squares / (self.count - 1)) if self.count > 1 else 0.0, self.dimension)
+    
+    @property
+    def minimum(self):
+        self.requireValues()
+        return Measure.fromBase(self.low if self.window is None else self.lows[0][1], self.dimension)
+    
+    @property
+    def maximum(self):
+        self.requireValues()
+        return Measure.fromBase(self.high if self.window is None else self.highs[0][1], self.dimension)
+    
+    def requireValues(self):
+        if not self.count:
+            raise ValueError("no measures have been accumulated")
+    
+    def __str__(self):
+        return "MeasureAccumulator({} measures in [{}])".format(self.count, self.dimension)
+    
+    __repr__ = __str__
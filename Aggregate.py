@@ -0,0 +1,144 @@
+"""
+reductions and histograms over many measures
+
+    total(readings, "kWh") # a plain number in kWh
+    percentile(depths, 95) # a Measure
+    histogram(depths, MeasureArray([0, 10, 20, 50], "ft")) # bins in ft over data in m
+
+the measures are checked for one common dimension once, then reduced with
+numpy over their values in base units
+bounds (bin edges, thresholds) can be measures in any unit of that dimension,
+strings like "3 ft", or plain numbers in the unit passed as unit
+"""
+from Measure import Measure, readUnit, readMeasure
+from MeasureArray import MeasureArray
+from numbers import Integral
+import numpy as np
+
+def baseValues(measures):
+    """
+    baseValues :: MeasureArray|Iterable Measure -> (numpy.ndarray, Dimension)
+    returns the values in base units and their common dimension
+    raises ValueError if there are no measures or they have different dimensions
+    """
+    if isinstance(measures, MeasureArray):
+        if not measures.value.size:
+            raise ValueError("cannot reduce an empty MeasureArray")
+        return (measures.value, measures.dimension)
+    measures = measures if isinstance(measures, list) else list(measures)
+    if not measures:
+        raise ValueError("cannot infer the dimension of an empty list of measures")
+    dimensions = {m.dimension for m in measures}
+    if len(dimensions) != 1:
+        raise ValueError("cannot reduce measures with different dimensions: " + ", ".join("[{}]".format(d) for d in dimensions))
+    values = np.fromiter((m.value for m in measures), dtype=np.float64, count=len(measures))
+    return (values, dimensions.pop())
+
+def result(values, dimension, unit):
+    """
+    result :: Number|numpy.ndarray -> Dimension -> String -> Measure|MeasureArray|Number|numpy.ndarray
+    returns the values as a measure, or as plain numbers in the unit if one is given
+    """
+    if unit is None:
+        if np.ndim(values) == 0:
+            return Measure.fromBase(float(values), dimension)
+        return MeasureArray.fromBase(values, dimension)
+    (m, d) = readUnit(unit)
+    if d is not dimension:
+        raise ValueError("the result is in [{}], not \"{}\" [{}]".format(dimension, unit, d))
+    return values/m if np.ndim(values) else float(values)/m
+
+def boundValues(bounds, dimension, unit=None):
+    """
+    boundValues :: Measure|MeasureArray|String|Number|Iterable -> Dimension -> String -> Number|numpy.ndarray
+    returns bounds in base units, checking that they are in the dimension
+    plain numbers are read in unit, which is required for them
+    """
+    if isinstance(bounds, str):
+        bounds = readMeasure(bounds)
+    if isinstance(bounds, Measure):
+        if bounds.dimension is not dimension:
+            raise ValueError("bounds in [{}] cannot be used on measures in [{}]".format(bounds.dimension, dimension))
+        return bounds.value
+    if np.ndim(bounds) == 0:
+        if unit is None:
+            raise ValueError("plain number bounds need a unit")
+        (m, d) = readUnit(unit)
+        if d is not dimension:
+            raise ValueError("bounds in \"{}\" [{}] cannot be used on measures in [{}]".format(unit, d, dimension))
+        return bounds*m
+    bounds = list(bounds)
+    if bounds and all(isinstance(b, (Measure, str)) for b in bounds):
+        return np.array([boundValues(b, dimension) for b in bounds], dtype=np.float64)
+    if unit is None:
+        raise ValueError("plain number bounds need a unit")
+    return boundValues(MeasureArray(bounds, unit), dimension)
+
+################################################################################
+# REDUCTIONS
+################################################################################
+
+def total(measures, unit=None):
+    (values, dimension) = baseValues(measures)
+    return result(values.sum(), dimension, unit)
+
+def mean(measures, unit=None):
+    (values, dimension) = baseValues(measures)
+    return result(values.mean(), dimension, unit)
+
+def std(measures, unit=None, ddof=0):
+    """
+    the standard deviation (the sample one with ddof=1)
+    """
+    (values, dimension) = baseValues(measures)
+    return result(values.std(ddof=ddof), dimension, unit)
+
+def minimum(measures, unit=None):
+    (values, dimension) = baseValues(measures)
+    return result(values.min(), dimension, unit)
+
+def maximum(measures, unit=None):
+    (values, dimension) = baseValues(measures)
+    return result(values.max(), dimension, unit)
+
+def percentile(measures, q, unit=None):
+    """
+    percentile :: [Measure] -> Number|[Number] -> String -> Measure|MeasureArray
+    q is a percentage (0 to 100), or several
+    """
+    (values, dimension) = baseValues(measures)
+    return result(np.percentile(values, q), dimension, unit)
+
+def median(measures, unit=None):
+    return percentile(measures, 50, unit)
+
+################################################################################
+# BINNING
+################################################################################
+
+def histogram(measures, bins, unit=None):
+    """
+    histogram :: [Measure] -> Int|MeasureArray|[Measure]|[Number] -> String -> (numpy.ndarray, MeasureArray|numpy.ndarray)
+    takes the measures and either a number of equal bins or the bin edges
+    (as measures in any unit of the dimension, or as numbers in unit)
+    returns the count in each bin and the bin edges (as numbers in unit if given)
+    """
+    (values, dimension) = baseValues(measures)
+    if isinstance(bins, Integral):
+        (counts, edges) = np.histogram(values, bins)
+    else:
+        (counts, edges) = np.histogram(values, boundValues(bins, dimension, unit))
+    return (counts, result(edges, dimension, unit))
+
+def countBetween(measures, low=None, high=None, unit=None):
+    """
+    countBetween :: [Measure] -> Measure|String|Number -> Measure|String|Number -> String -> Int
+    returns how many measures are at least low and below high (either bound can be None)
+    """
+    (values, dimension) = baseValues(measures)
+    keep = np.ones(values.shape, dtype=bool)
+    if low is not None:
+        keep &= values >= boundValues(low, dimension, unit)
+    if high is not None:
+        keep &= values < boundValues(high, dimension, unit)
+    return int(np.count_nonzero(keep))
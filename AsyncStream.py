@@ -0,0 +1,160 @@
+"""
+asyncio adapters normalizing live streams of (value, unit string) pairs
+
+pairs are gathered into micro-batches (up to batchSize pairs, or whatever
+arrived within window seconds) so units are looked up once per batch, and
+the source is only read ahead by a bounded buffer, so a slow consumer slows
+the source down instead of letting memory grow
+unit strings that have never been seen are parsed on a worker thread, so a
+first-time parse never blocks the event loop
+"""
+from Measure import Measure, readUnit, parseUnit, unitCache
+import asyncio
+
+end = object() # marks the end of the source in the buffer
+
+class Failure:
+    """
+    an exception raised by the source, passed through the buffer
+    """
+    __slots__ = ("exception",)
+    
+    def __init__(self, exception):
+        self.exception = exception
+
+async def readInto(source, buffer):
+    """
+    copies the pairs of an async iterable into the buffer, then marks the end
+    """
+    try:
+        async for pair in source:
+            await buffer.put(pair)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exception:
+        await buffer.put(Failure(exception))
+    await buffer.put(end)
+
+async def batchPairs(source, batchSize=1024, window=0.01, bufferSize=None):
+    """
+    batchPairs :: AsyncIterable (Number, String) -> Int -> Number -> Int -> AsyncIterator [(Number, String)]
+    yields lists of pairs, each one holding up to batchSize pairs or the pairs
+    that arrived within window seconds of the first one
+    at most bufferSize pairs (4 batches by default) are read ahead of the consumer
+    """
+    loop = asyncio.get_running_loop()
+    buffer = asyncio.Queue(bufferSize or 4*batchSize)
+    reader = asyncio.ensure_future(readInto(source, buffer))
+    getter = None
+    try:
+        finished = False
+        failure = None
+        while not finished:
+            item = await (getter or buffer.get())
+            getter = None
+            batch = []
+            deadline = loop.time() + window
+            while True:
+                if item is end:
+                    finished = True
+                    break
+                if isinstance(item, Failure): # deliver the pairs before it first
+                    (finished, failure) = (True, item.exception)
+                    break
+                batch.append(item)
+                if len(batch) >= batchSize:
+                    break
+                if not buffer.empty(): # take what is already waiting without sleeping
+                    item = buffer.get_nowait()
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                getter = asyncio.ensure_future(buffer.get())
+                (done, _) = await asyncio.wait([getter], timeout=timeout)
+                if not done: # keep waiting on the same getter for the next batch
+                    break
+                item = getter.result()
+                getter = None
+            if batch:
+                yield batch
+        if failure is not None:
+            raise failure
+    finally:
+        if getter is not None:
+            getter.cancel()
+        reader.cancel()
+
+async def readUnits(unitStrings):
+    """
+    readUnits :: Iterable String -> {String: (Number, Dimension)}
+    looks up each unit string, parsing unseen ones on a worker thread
+    """
+    loop = asyncio.get_running_loop()
+    parsed = {}
+    for unit in unitStrings:
+        if unit in unitCache:
+            parsed[unit] = readUnit(unit)
+        else:
+            parsed[unit] = unitCache.store(unit, await loop.run_in_executor(None, parseUnit, unit))
+    return parsed
+
+async def measureBatches(source, batchSize=1024, window=0.01, bufferSize=None, onError=None):
+    """
+    measureBatches :: AsyncIterable (Number, String) -> ... -> AsyncIterator [Measure]
+    yields each micro-batch of pairs as a list of measures
+    pairs with unreadable units are passed to onError(pair, exception) and
+    left out; without onError the exception is raised
+    """
+    async for batch in batchPairs(source, batchSize, window, bufferSize):
+        parsed = await readBatchUnits(batch, onError)
+        fromBase = Measure.fromBase
+        measures = []
+        for (value, unit) in batch:
+            if unit in parsed:
+                (m, d) = parsed[unit]
+                measures.append(fromBase(value*m, d))
+        yield measures
+
+async def measureStream(source, batchSize=1024, window=0.01, bufferSize=None, onError=None):
+    """
+    measureStream :: AsyncIterable (Number, String) -> ... -> AsyncIterator Measure
+    yields each pair as a measure, normalized in micro-batches
+    """
+    async for measures in measureBatches(source, batchSize, window, bufferSize, onError):
+        for measure in measures:
+            yield measure
+
+async def arrayBatches(source, unit, batchSize=1024, window=0.01, bufferSize=None, onError=None):
+    """
+    arrayBatches :: AsyncIterable (Number, String) -> String -> ... -> AsyncIterator MeasureArray
+    yields each micro-batch as one MeasureArray in the dimension of unit
+    pairs in another dimension are treated like pairs with unreadable units
+    """
+    import numpy as np # only needed by this adapter
+    from MeasureArray import MeasureArray
+    (_, dimension) = (await readUnits([unit]))[unit]
+    async for batch in batchPairs(source, batchSize, window, bufferSize):
+        parsed = await readBatchUnits(batch, onError, dimension)
+        values = np.fromiter((value * parsed[u][0] for (value, u) in batch if u in parsed), dtype=np.float64)
+        yield MeasureArray.fromBase(values, dimension)
+
+async def readBatchUnits(batch, onError, dimension=None):
+    """
+    readBatchUnits :: [(Number, String)] -> Function -> Dimension -> {String: (Number, Dimension)}
+    returns the units of the batch that could be read (and have the dimension, if given)
+    """
+    parsed = {}
+    for unit in {u for (_, u) in batch}:
+        try:
+            (m, d) = (await readUnits([unit]))[unit]
+            if dimension is not None and d is not dimension:
+                raise ValueError("\"{}\" [{}] is not in [{}]".format(unit, d, dimension))
+            parsed[unit] = (m, d)
+        except (ValueError, KeyError, AttributeError, TypeError) as exception:
+            if onError is None:
+                raise
+            for pair in batch:
+                if pair[1] == unit:
+                    onError(pair, exception)
+    return parsed
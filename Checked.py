@@ -0,0 +1,100 @@
+"""
+unit checks at function boundaries
+
+    @checkUnits("m", "s", returns="m/s")
+    def speed(distance, time):
+        return distance / time
+
+arguments and return values are checked against the dimension of their unit,
+and plain numbers are read as being in that unit
+set PYUNITS_CHECKS=0 (or call setChecking(False) before the functions are
+defined) and checkUnits returns the functions untouched, so they cost nothing
+"""
+from Measure import Measure, readUnit
+from functools import wraps
+from numbers import Number
+import inspect
+import os
+
+checking = os.environ.get("PYUNITS_CHECKS", "1").lower() not in ("0", "false", "no", "off")
+
+def setChecking(enabled):
+    """
+    turns the checks on or off
+    functions decorated while checks are off are never checked; functions
+    decorated while they are on skip their checks while they are off
+    """
+    global checking
+    checking = bool(enabled)
+
+def isChecking():
+    return checking
+
+class UnitSpec:
+    """
+    a parsed unit that arguments or results must have
+    """
+    __slots__ = ("unit", "multiplier", "dimension")
+    
+    def __init__(self, unit):
+        (self.multiplier, self.dimension) = readUnit(unit)
+        self.unit = unit
+    
+    def check(self, value, what):
+        """
+        check :: a -> String -> Measure
+        returns the value as a measure in the dimension of this unit
+        raises ValueError if it has another dimension
+        """
+        if isinstance(value, Measure):
+            if value.dimension is not self.dimension:
+                raise ValueError("{} must be in [{}] (\"{}\"), not [{}]".format(what, self.dimension, self.unit, value.dimension))
+            return value
+        if isinstance(value, Number):
+            return Measure.fromBase(value * self.multiplier, self.dimension)
+        raise TypeError("{} must be a Measure or a number in \"{}\", not {}".format(what, self.unit, type(value).__name__))
+
+def checkUnits(*units, returns=None, **namedUnits):
+    """
+    checkUnits :: String... -> String -> {String: String} -> (Function -> Function)
+    takes the units of the positional parameters (None to skip one), the unit
+    of the result and the units of parameters by name
+    returns a decorator checking those on every call
+    all units are parsed once, when the function is decorated
+    """
+    def decorate(function):
+        if not checking:
+            return function
+        parameters = list(inspect.signature(function).parameters)
+        specs = {} # {parameter name: UnitSpec}
+        for (name, unit) in zip(parameters, units):
+            if unit is not None:
+                specs[name] = UnitSpec(unit)
+        for (name, unit) in namedUnits.items():
+            if name not in parameters:
+                raise TypeError("{}() has no parameter \"{}\"".format(function.__name__, name))
+            specs[name] = UnitSpec(unit)
+        labels = {name: "argument \"{}\" of {}()".format(name, function.__name__) for name in specs}
+        positional = [(index, labels[name], specs[name]) for (index, name) in enumerate(parameters) if name in specs]
+        result = UnitSpec(returns) if returns is not None else None
+        resultLabel = "the result of {}()".format(function.__name__)
+        
+        @wraps(function)
+        def checked(*args, **kwargs):
+            if not checking:
+                return function(*args, **kwargs)
+            if positional:
+                args = list(args)
+                for (index, label, spec) in positional:
+                    if index < len(args):
+                        args[index] = spec.check(args[index], label)
+            for (name, value) in kwargs.items():
+                spec = specs.get(name)
+                if spec is not None:
+                    kwargs[name] = spec.check(value, labels[name])
+            value = function(*args, **kwargs)
+            if result is not None:
+                value = result.check(value, resultLabel)
+            return value
+        return checked
+    return decorate
@@ -0,0 +1,64 @@
+from Measure import readUnit
+from array import array
+from numbers import Number
+try:
+    import numpy as np
+except ImportError: # numpy is optional, buffers are then converted element by element
+    np = None
+
+class Converter:
+    """
+    converts plain numbers from one unit to another
+    the units are parsed and checked once when the converter is made, so each
+    conversion is a single multiply by the combined factor
+    """
+    __slots__ = ("fromUnit", "toUnit", "factor")
+    
+    def __init__(self, fromUnit, toUnit):
+        """
+        fromUnit :: String
+        toUnit :: String
+        """
+        (fm, fd) = readUnit(fromUnit)
+        (tm, td) = readUnit(toUnit)
+        if fd != td:
+            raise ValueError("cannot convert \"{}\" [{}] to \"{}\" [{}]".format(fromUnit, fd, toUnit, td))
+        self.fromUnit = fromUnit
+        self.toUnit = toUnit
+        self.factor = fm/tm
+    
+    def __call__(self, values, out=None):
+        """
+        convert :: a -> a
+        takes a number, a sequence of numbers, an array.array or a numpy array
+        returns the values converted to toUnit, in the same kind of container
+        if out is given, the results are written into it and it is returned
+        """
+        factor = self.factor
+        if isinstance(values, Number) and out is None:
+            return values*factor
+        if np is not None:
+            if isinstance(values, np.ndarray) or isinstance(out, np.ndarray):
+                return np.multiply(values, factor, out=out)
+            if isinstance(values, array) and values.typecode in "fd" and (out is None or isinstance(out, array)):
+                if out is None:
+                    out = array(values.typecode, bytes(values.itemsize * len(values)))
+                np.multiply(np.frombuffer(values, dtype=values.typecode), factor, out=np.frombuffer(out, dtype=out.typecode))
+                return out
+        if out is None:
+            if isinstance(values, array):
+                return array(values.typecode if values.typecode in "fd" else "d", [v*factor for v in values])
+            return [v*factor for v in values]
+        for (i, v) in enumerate(values):
+            out[i] = v*factor
+        return out
+    
+    def inverse(self):
+        """
+        inverse :: () -> Converter
+        returns the converter going the other way
+        """
+        return Converter(self.toUnit, self.fromUnit)
+    
+    def __repr__(self):
+        return "Converter(\"{}\", \"{}\")".format(self.fromUnit, self.toUnit)
@@ -0,0 +1,232 @@
+"""
+pick readable units to display measures in
+
+    bestUnit(Measure(12000, "N")) # "kN"
+    simplify(Measure(30, "in"), "imperial") # (2.5, "ft")
+
+the named units of the units table are indexed by dimension once, and the
+units a system may display are laid out per dimension as a ladder sorted by
+size, so a query is two dict lookups and a bisect
+"""
+import Measure as measureModule
+from Measure import Measure, readUnit, prefixes, prefixableUnits, applyPrefix, getUnitMultiplierAndDimension
+from Unit import chunks
+from bisect import bisect_right
+from math import isclose
+
+class DisplaySystem:
+    """
+    the units a system of measurement displays measures in
+    """
+    def __init__(self, units, prefixed=False, fallback=None):
+        """
+        units :: [String] -- units of the units table, most preferred first
+        prefixed :: Bool -- whether to add the engineering prefixes (k, M, m, μ, ...) to prefixable units
+        fallback :: String -- the system used for dimensions that none of the units have
+        """
+        self.units = units
+        self.prefixed = prefixed
+        self.fallback = fallback
+
+# systems :: {name: DisplaySystem}
+# add a system here to make it available to bestUnit and simplify
+systems = {
+    "SI": DisplaySystem(["m", "g", "s", "A", "K", "mol", "cd", "rad", "Hz", "N", "Pa", "J", "W", "C", "V", "Ω", "F", "S", "Wb", "T", "H", "L"], prefixed=True),
+    "imperial": DisplaySystem(["in", "ft", "yd", "mi", "acre", "qt", "gal", "lbf", "°R", "RPM"], fallback="SI"),
+    }
+
+engineeringPrefixes = [prefix for (prefix, power) in prefixes.items() if power % 3 == 0]
+
+class UnitIndex:
+    """
+    the named units of a compiled units table, indexed by dimension
+    """
+    def __init__(self, compiled):
+        self.compiled = compiled # the table this index was built from
+        self.byDimension = {} # {Dimension: [unit]}
+        for unit in measureModule.units:
+            (_, d) = getUnitMultiplierAndDimension(unit)
+            self.byDimension.setdefault(d, []).append(unit)
+        self.ladders = {} # {(system name, Dimension): ([multiplier], [unit])}
+    
+    def namedUnits(self, dimension):
+        return self.byDimension.get(dimension, [])
+    
+    def ladder(self, system, dimension):
+        """
+        ladder :: String -> Dimension -> ([Number], [String])
+        returns the multipliers (ascending) and names of the units the system
+        displays the dimension in, empty if it has none
+        """
+        key = (system, dimension)
+        if key not in self.ladders:
+            rules = systems[system]
+            rungs = {} # {multiplier: unit}, the first unit of a size wins
+            for unit in rules.units:
+                (m, d) = getUnitMultiplierAndDimension(unit)
+                if d is not dimension:
+                    continue
+                rungs.setdefault(m, unit)
+                if rules.prefixed and unit in prefixableUnits:
+                    for prefix in engineeringPrefixes:
+                        name = prefix + unit
+                        (pm, pd) = getUnitMultiplierAndDimension(name)
+                        # skip names that read back as another unit (ex: "Gs" is the gauss, not a gigasecond)
+                        if pd is not d or not isclose(pm, applyPrefix(prefix, m)):
+                            continue
+                        rungs.setdefault(pm, name)
+            if not rungs and rules.fallback is not None:
+                self.ladders[key] = self.ladder(rules.fallback, dimension)
+            else:
+                multipliers = sorted(rungs)
+                self.ladders[key] = (multipliers, [rungs[m] for m in multipliers])
+        return self.ladders[key]
+
+index = None
+
+def unitIndex():
+    """
+    unitIndex :: () -> UnitIndex
+    returns the index of the current units table, rebuilt after reloadUnits
+    """
+    global index
+    if index is None or index.compiled is not measureModule.compiledUnits:
+        index = UnitIndex(measureModule.compiledUnits)
+    return index
+
+def namedUnits(dimension):
+    """
+    namedUnits :: Dimension -> [String]
+    returns the units of the units table with the dimension (ex: ["N", "lbf"])
+    """
+    return unitIndex().namedUnits(dimension)
+
+def simplify(measure, system="SI"):
+    """
+    simplify :: Measure -> String -> (Number, String)
+    returns the value of the measure in its best display unit, and that unit
+    the best unit is the largest one of the system that the value is at least 1 of
+    (the largest magnitude is used for arrays)
+    if the system has no unit for the dimension, the base units are used
+    """
+    (multipliers, names) = unitIndex().ladder(system, measure.dimension)
+    if not names:
+        return (measure.value, str(measure.dimension))
+    magnitude = abs(measure.value)
+    if hasattr(magnitude, "max"): # an array
+        magnitude = magnitude.max() if magnitude.size else 0
+    rung = pickRung(multipliers, magnitude)
+    return (measure.value / multipliers[rung], names[rung])
+
+def pickRung(multipliers, magnitude):
+    """
+    pickRung :: [Number] -> Number -> Int
+    returns the index of the largest multiplier at most the magnitude (the
+    smallest one if there is none, and the coherent unit for 0)
+    """
+    if magnitude == 0 and 1 in multipliers:
+        return multipliers.index(1)
+    return max(bisect_right(multipliers, magnitude) - 1, 0)
+
+def bestUnit(measure, system="SI"):
+    """
+    bestUnit :: Measure -> String -> String
+    returns the best unit of the system to display the measure in
+    """
+    return simplify(measure, system)[1]
+
+################################################################################
+# BULK FORMATTING
+################################################################################
+
+class MeasureFormatter:
+    """
+    formats many measures of one dimension with the same spec as format()
+    the unit and the text after each value are worked out once per batch, and
+    each value is then rendered by one str.format call
+    """
+    def __init__(self, spec="", chunkSize=4096):
+        """
+        spec :: String -- a format spec for Measure (ex: ".3f kPa", ".1f ~imperial")
+        chunkSize :: Int -- how many values writeMany renders at a time
+        """
+        (self.number, _, self.unit) = spec.partition(" ")
+        self.chunkSize = chunkSize
+        if self.unit and self.unit[0] != "~" and self.unit != "^":
+            (self.multiplier, self.dimension) = readUnit(self.unit)
+        else:
+            (self.multiplier, self.dimension) = (1, None)
+    
+    def formatMany(self, measures):
+        """
+        formatMany :: MeasureArray|Iterable Measure -> [String]
+        raises ValueError if the measures are not all in one dimension (or in
+        the dimension of the unit of the spec)
+        """
+        (values, dimension) = valueList(measures)
+        if not values:
+            return []
+        (values, template) = self.prepare(values, dimension)
+        return list(map(template.format, values))
+    
+    def writeMany(self, measures, stream, separator="\n"):
+        """
+        writes the formatted measures to a text stream, each followed by the separator
+        """
+        if isinstance(measures, Measure): # a MeasureArray
+            measures = [measures[i:i + self.chunkSize] for i in range(0, len(measures), self.chunkSize)]
+        else:
+            measures = chunks(measures, self.chunkSize)
+        for chunk in measures:
+            texts = self.formatMany(chunk)
+            if texts:
+                stream.write(separator.join(texts))
+                stream.write(separator)
+    
+    def prepare(self, values, dimension):
+        """
+        prepare :: [Number] -> Dimension -> ([Number], String)
+        returns the values in the unit of the spec, and the template rendering one
+        """
+        unit = self.unit
+        if not unit:
+            suffix = " [" + str(dimension) + "]"
+        elif unit == "^":
+            suffix = " [" + dimension.format("superscript") + "]"
+        elif unit[0] == "~":
+            (multipliers, names) = unitIndex().ladder(unit[1:] or "SI", dimension)
+            if names:
+                magnitude = max(abs(v) for v in values)
+                rung = pickRung(multipliers, magnitude)
+                values = scale(values, multipliers[rung])
+                suffix = " " + names[rung]
+            else:
+                suffix = " " + str(dimension)
+        else:
+            if dimension is not self.dimension:
+                raise ValueError("[{}] cannot be shown in \"{}\" [{}]".format(dimension, unit, self.dimension))
+            values = scale(values, self.multiplier)
+            suffix = " " + unit
+        template = "{:" + self.number + "}" + suffix.replace("{", "{{").replace("}", "}}")
+        return (values, template)
+
+def valueList(measures):
+    """
+    valueList :: MeasureArray|Iterable Measure -> ([Number], Dimension)
+    returns the values in base units as a list and their common dimension
+    (None if there are no measures), without needing numpy (unlike Aggregate.baseValues)
+    """
+    if isinstance(measures, Measure): # a MeasureArray
+        return (measures.value.ravel().tolist(), measures.dimension)
+    values = []
+    dimension = None
+    for measure in measures:
+        if measure.dimension is not dimension:
+            if dimension is not None:
+                raise ValueError("the measures are not all in one dimension: [{}] and [{}]".format(dimension, measure.dimension))
+            dimension = measure.dimension
+        values.append(measure.value)
+    return (values, dimension)
+
+def scale(values, multiplier):
+    return values if multiplier == 1 else [v / multiplier for v in values]
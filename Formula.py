@@ -0,0 +1,224 @@
+"""
+compile unit-aware formulas into plain arithmetic on numbers
+
+    conduction = compileFormula(lambda k, A, dT, dx: k*A*dT/dx, {"k": "W/m*K", "A": "ft^2", "dT": "K", "dx": "in"}, "W")
+    conduction(0.6, 10, 20, 4) # a float in W, works on numpy arrays too
+
+the formula is run once on placeholder measures to record what it computes,
+checking every dimension along the way, then the record is turned into one
+expression with all unit conversion factors folded into constants
+"""
+from Measure import Measure, readUnit
+from Unit import Dimension
+from numbers import Number
+
+dimensionless = Dimension()
+
+# expressions are nested tuples:
+#   ("constant", number), ("input", name), ("neg", expression),
+#   ("**", expression, number) and (operator, expression, expression) for + - * /
+
+class Symbol(Measure):
+    """
+    a placeholder measure used to trace a formula
+    its value is the expression computing it instead of a number
+    Symbol subclasses Measure so that Measure constants combine with it here
+    """
+    __slots__ = ()
+    __hash__ = None
+    
+    def __bool__(self):
+        raise TypeError("a compiled formula cannot branch on the value of a measure")
+    
+    def __float__(self):
+        raise TypeError("a compiled formula cannot convert a measure to a float, use the sqrt from Measure")
+    
+    __int__ = __float__
+    
+    def __eq__(self, other):
+        raise TypeError("a compiled formula cannot compare measures")
+    
+    __ne__ = __lt__ = __le__ = __ge__ = __gt__ = __eq__
+    
+    def __pos__(self):
+        return self
+    
+    def __neg__(self):
+        return Symbol.fromBase(negate(self.value), self.dimension)
+    
+    def __abs__(self):
+        raise TypeError("a compiled formula cannot take the absolute value of a measure")
+    
+    def __add__(self, other):
+        (node, dimension) = operand(other)
+        return Symbol.fromBase(combine("+", self.value, node), self.dimension + dimension)
+    
+    def __radd__(self, other):
+        (node, dimension) = operand(other)
+        return Symbol.fromBase(combine("+", node, self.value), dimension + self.dimension)
+    
+    def __sub__(self, other):
+        (node, dimension) = operand(other)
+        return Symbol.fromBase(combine("-", self.value, node), self.dimension - dimension)
+    
+    def __rsub__(self, other):
+        (node, dimension) = operand(other)
+        return Symbol.fromBase(combine("-", node, self.value), dimension - self.dimension)
+    
+    def __mul__(self, other):
+        (node, dimension) = operand(other)
+        return Symbol.fromBase(combine("*", self.value, node), self.dimension * dimension)
+    
+    def __rmul__(self, other):
+        (node, dimension) = operand(other)
+        return Symbol.fromBase(combine("*", node, self.value), dimension * self.dimension)
+    
+    def __truediv__(self, other):
+        (node, dimension) = operand(other)
+        return Symbol.fromBase(combine("/", self.value, node), self.dimension / dimension)
+    
+    def __rtruediv__(self, other):
+        (node, dimension) = operand(other)
+        return Symbol.fromBase(combine("/", node, self.value), dimension / self.dimension)
+    
+    def __pow__(self, power):
+        if not isinstance(power, Number):
+            raise TypeError("a compiled formula can only raise measures to constant powers")
+        return Symbol.fromBase(raisePower(self.value, power), self.dimension ** power)
+    
+    # a symbol stands for one value of the formula, so it is never changed in place
+    __iadd__ = __add__
+    __isub__ = __sub__
+    __imul__ = __mul__
+    __itruediv__ = __truediv__
+    __ipow__ = __pow__
+    
+    def __getitem__(self, key):
+        (m, d) = readUnit(key)
+        if d != self.dimension:
+            raise ValueError("the measure is not in the dimension of that unit")
+        return Symbol.fromBase(combine("/", self.value, ("constant", m)), dimensionless)
+    
+    def __str__(self):
+        return render(self.value) + " [" + str(self.dimension) + "]"
+
+def operand(x):
+    """
+    operand :: Symbol|Measure|Number -> (Expression, Dimension)
+    returns the expression and dimension of something combined with a symbol
+    """
+    if isinstance(x, Symbol):
+        return (x.value, x.dimension)
+    elif isinstance(x, Measure):
+        return (("constant", x.value), x.dimension)
+    elif isinstance(x, Number):
+        return (("constant", x), dimensionless)
+    else:
+        raise TypeError("cannot use {} in a compiled formula".format(type(x).__name__))
+
+################################################################################
+# EXPRESSIONS
+################################################################################
+
+operations = {"+": lambda a, b: a + b, "-": lambda a, b: a - b, "*": lambda a, b: a * b, "/": lambda a, b: a / b}
+
+def combine(operator, a, b):
+    """
+    combine :: String -> Expression -> Expression -> Expression
+    returns the expression a operator b, folding constants where possible
+    """
+    if a[0] == "constant" and b[0] == "constant":
+        return ("constant", operations[operator](a[1], b[1]))
+    if operator == "/" and b[0] == "constant": # divide by a constant as a multiply
+        return combine("*", ("constant", 1/b[1]), a)
+    if operator == "*":
+        if b[0] == "constant": # keep constants on the left
+            (a, b) = (b, a)
+        if a[0] == "constant":
+            if a[1] == 1:
+                return b
+            if b[0] == "*" and b[1][0] == "constant": # c1 * (c2 * x) -> (c1*c2) * x
+                return combine("*", ("constant", a[1] * b[1][1]), b[2])
+            if b[0] == "/" and b[1][0] == "constant": # c1 * (c2 / x) -> (c1*c2) / x
+                return ("/", ("constant", a[1] * b[1][1]), b[2])
+            return ("*", a, b)
+    if operator in "*/":
+        # pull constant factors out to the left so that they fold together
+        if a[0] == "*" and a[1][0] == "constant": # (c * x) op y -> c * (x op y)
+            return combine("*", a[1], combine(operator, a[2], b))
+        if b[0] == "*" and b[1][0] == "constant": # x op (c * y) -> c^±1 * (x op y)
+            return combine("*", ("constant", b[1][1] if operator == "*" else 1/b[1][1]), combine(operator, a, b[2]))
+    return (operator, a, b)
+
+def negate(a):
+    if a[0] == "constant":
+        return ("constant", -a[1])
+    if a[0] == "*" and a[1][0] == "constant":
+        return ("*", ("constant", -a[1][1]), a[2])
+    return ("neg", a)
+
+def raisePower(a, power):
+    if power == 1:
+        return a
+    if a[0] == "constant":
+        return ("constant", a[1] ** power)
+    if a[0] == "*" and a[1][0] == "constant": # (c * x)^p -> c^p * x^p
+        return combine("*", ("constant", a[1][1] ** power), raisePower(a[2], power))
+    return ("**", a, power)
+
+def render(node):
+    """
+    render :: Expression -> String
+    returns python source computing the expression
+    """
+    kind = node[0]
+    if kind == "constant":
+        return literal(node[1])
+    elif kind == "input":
+        return node[1]
+    elif kind == "neg":
+        return "(-" + render(node[1]) + ")"
+    elif kind == "**":
+        return "(" + render(node[1]) + " ** " + literal(node[2]) + ")"
+    else:
+        return "(" + render(node[1]) + " " + kind + " " + render(node[2]) + ")"
+
+def literal(number):
+    return repr(number if isinstance(number, int) else float(number))
+
+################################################################################
+# COMPILING
+################################################################################
+
+def compileFormula(function, inputs, output=None):
+    """
+    compileFormula :: (Measure... -> Measure) -> [String]|{String: String} -> String -> (Number... -> Number)
+    takes a formula written with Measure arithmetic, the unit of each of its
+    arguments (a list, or a dict from argument name to unit) and optionally the
+    unit of its result
+    returns a function taking plain numbers in those units and returning the
+    result as a plain number in the output unit (base units if no output unit)
+    the returned function has the result dimension and its generated source as
+    its dimension and source attributes
+    raises ValueError if the dimensions of the formula do not work out
+    """
+    if not isinstance(inputs, dict):
+        inputs = {"x{}".format(i): unit for (i, unit) in enumerate(inputs)}
+    for name in inputs:
+        if not name.isidentifier():
+            raise ValueError("\"{}\" cannot be used as an argument name".format(name))
+    symbols = []
+    for (name, unit) in inputs.items():
+        (m, d) = readUnit(unit)
+        symbols.append(Symbol.fromBase(combine("*", ("constant", m), ("input", name)), d))
+    (node, dimension) = operand(function(*symbols))
+    if output is not None:
+        (m, d) = readUnit(output)
+        if d != dimension:
+            raise ValueError("the formula gives [{}], not \"{}\" [{}]".format(dimension, output, d))
+        node = combine("/", node, ("constant", m))
+    source = "lambda {}: {}".format(", ".join(inputs), render(node))
+    compiled = eval(source, {})
+    compiled.dimension = dimension
+    compiled.source = source
+    return compiled
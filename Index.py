@@ -0,0 +1,184 @@
+"""
+a sorted index over measures of one dimension
+
+    index = MeasureIndex.fromValues(lengths, "m")
+    index.range("3 ft", "2 m") # the measures between, in order
+    index.firstAbove(Measure(5, "ft")) # the shortest length over 5 ft
+    index.nearest("1 yd")
+
+measures are kept sorted by their value in base units, so a bound in any unit
+of the dimension is converted once and then found by bisection
+"""
+from Measure import Measure, readUnit, readMeasure
+from bisect import bisect_left, bisect_right
+from numbers import Number
+
+class MeasureIndex:
+    """
+    measures sorted by value, each with an optional item (ex: the record it came from)
+    """
+    def __init__(self, unit, measures=()):
+        """
+        unit :: String -- sets the dimension, and the unit of plain number bounds
+        measures :: Iterable Measure -- indexed, with no items
+        """
+        (self.multiplier, self.dimension) = readUnit(unit)
+        self.unit = unit
+        self.keys = [] # the values in base units, ascending
+        self.items = [] # the item of each key, None for a bare measure
+        for measure in measures:
+            self.insert(measure)
+    
+    @classmethod
+    def fromValues(cls, values, unit, items=None):
+        """
+        fromValues :: Iterable Number -> String -> [a] -> MeasureIndex
+        builds an index from plain numbers in unit (a list, array.array, numpy
+        array, ...), sorting them once
+        items, if given, are kept with the values they belong to
+        """
+        index = cls(unit)
+        m = index.multiplier
+        if items is None:
+            index.keys = sorted(float(v)*m for v in values)
+            index.items = [None] * len(index.keys)
+        else:
+            pairs = sorted(zip((float(v)*m for v in values), range(len(items))))
+            index.keys = [key for (key, _) in pairs]
+            index.items = [items[i] for (_, i) in pairs]
+        return index
+    
+    def key(self, bound):
+        """
+        key :: Measure|String|Number -> Number
+        returns the bound in base units: a Measure in the dimension, a string
+        like "3 ft", or a number in the unit of the index
+        """
+        if isinstance(bound, str):
+            bound = readMeasure(bound)
+        if isinstance(bound, Measure):
+            if bound.dimension is not self.dimension:
+                raise ValueError("[{}] cannot be looked up in an index of [{}]".format(bound.dimension, self.dimension))
+            return bound.value
+        if isinstance(bound, Number):
+            return bound * self.multiplier
+        raise TypeError("cannot look up {} in a MeasureIndex".format(type(bound).__name__))
+    
+    def entry(self, position):
+        item = self.items[position]
+        return Measure.fromBase(self.keys[position], self.dimension) if item is None else item
+    
+    def insert(self, measure, item=None):
+        """
+        adds a measure (or a bound, see key), with an item returned in its place by queries
+        """
+        key = self.key(measure)
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.items.insert(position, item)
+    
+    def remove(self, measure, item=None):
+        """
+        removes a measure with that value (and that item, if given)
+        raises ValueError if there is none
+        """
+        key = self.key(measure)
+        for position in range(bisect_left(self.keys, key), bisect_right(self.keys, key)):
+            if item is None or self.items[position] == item:
+                del self.keys[position], self.items[position]
+                return
+        raise ValueError("{} is not in the index".format(measure))
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def __iter__(self):
+        return (self.entry(i) for i in range(len(self.keys)))
+    
+    def __contains__(self, measure):
+        key = self.key(measure)
+        position = bisect_left(self.keys, key)
+        return position < len(self.keys) and self.keys[position] == key
+    
+    def bounds(self, low, high):
+        """
+        bounds :: Bound -> Bound -> (Int, Int)
+        returns the positions of the entries from low to high, inclusive (either can be None)
+        """
+        start = 0 if low is None else bisect_left(self.keys, self.key(low))
+        stop = len(self.keys) if high is None else bisect_right(self.keys, self.key(high))
+        return (start, max(start, stop))
+    
+    def range(self, low=None, high=None):
+        """
+        range :: Bound -> Bound -> [Measure|a]
+        returns the entries from low to high (inclusive), in ascending order
+        """
+        (start, stop) = self.bounds(low, high)
+        return [self.entry(i) for i in range(start, stop)]
+    
+    def count(self, low=None, high=None):
+        """
+        count :: Bound -> Bound -> Int
+        returns how many entries are from low to high (inclusive), in O(log n)
+        """
+        (start, stop) = self.bounds(low, high)
+        return stop - start
+    
+    def firstAbove(self, bound):
+        """
+        firstAbove :: Bound -> Measure|a|None
+        returns the smallest entry greater than the bound
+        """
+        position = bisect_right(self.keys, self.key(bound))
+        return self.entry(position) if position < len(self.keys) else None
+    
+    def lastBelow(self, bound):
+        """
+        lastBelow :: Bound -> Measure|a|None
+        returns the largest entry less than the bound
+        """
+        position = bisect_left(self.keys, self.key(bound))
+        return self.entry(position - 1) if position else None
+    
+    def nearest(self, bound, k=None):
+        """
+        nearest :: Bound -> Int -> Measure|a|[Measure|a]
+        returns the entry closest to the bound, or the k closest ones (closest first)
+        """
+        key = self.key(bound)
+        if k is not None and k <= 0:
+            return []
+        keys = self.keys
+        right = bisect_left(keys, key)
+        left = right - 1
+        found = []
+        while len(found) < (1 if k is None else k) and (left >= 0 or right < len(keys)):
+            if right >= len(keys) or (left >= 0 and key - keys[left] <= keys[right] - key):
+                found.append(left)
+                left -= 1
+            else:
+                found.append(right)
+                right += 1
+        if k is None:
+            return self.entry(found[0]) if found else None
+        return [self.entry(i) for i in found]
+    
+    def smallest(self, k):
+        """
+        smallest :: Int -> [Measure|a]
+        returns the k smallest entries, smallest first
+        """
+        return [self.entry(i) for i in range(min(k, len(self.keys)))]
+    
+    def largest(self, k):
+        """
+        largest :: Int -> [Measure|a]
+        returns the k largest entries, largest first
+        """
+        return [self.entry(i) for i in range(len(self.keys) - 1, max(len(self.keys) - k, 0) - 1, -1)]
+    
+    def __str__(self):
+        return "MeasureIndex({} measures in [{}])".format(len(self.keys), self.dimension)
+    
+    __repr__ = __str__
@@ -0,0 +1,214 @@
+"""
+opt-in counters and timings for unit operations
+
+while disabled nothing is wrapped, so the library runs at full speed
+enabling swaps timing wrappers into the hot paths and disabling puts the
+original functions back
+
+    with instrumented():
+        run()
+    stats = snapshot()
+"""
+import Measure as measureModule
+from Measure import Measure, unitCache
+from Unit import Dimension, canonicalExponent
+from contextlib import contextmanager
+from threading import Lock, local
+from time import perf_counter_ns
+
+# the Measure operators that are counted and timed
+operators = ["__init__", "__eq__", "__ne__", "__lt__", "__le__", "__ge__", "__gt__", "__pos__", "__neg__", "__abs__", "__add__", "__iadd__", "__sub__", "__isub__", "__mul__", "__rmul__", "__imul__", "__truediv__", "__rtruediv__", "__itruediv__", "__pow__", "__ipow__", "__round__", "__trunc__", "__ceil__", "__str__", "__getitem__"]
+
+class Stats:
+    """
+    the call count, total time and time histogram of one kind of call
+    the histogram counts calls by the power of two nanoseconds they took
+    """
+    __slots__ = ("count", "nanoseconds", "histogram")
+    
+    def __init__(self):
+        self.count = 0
+        self.nanoseconds = 0
+        self.histogram = {} # {upper bound in ns: count}
+    
+    def record(self, nanoseconds):
+        self.count += 1
+        self.nanoseconds += nanoseconds
+        bucket = 1 << nanoseconds.bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+    
+    def summary(self):
+        """
+        summary :: () -> {String: a}
+        """
+        return {"count": self.count, "seconds": self.nanoseconds / 1e9, "histogram": dict(sorted(self.histogram.items()))}
+
+operations = {} # {operation: Stats}
+unitLookups = {} # {unit string: Stats} -- every readUnit call, cached or not
+unitParses = {} # {unit string: Stats} -- cache misses that had to be parsed
+registryLookups = {} # {unit name: Int} -- single unit names resolved while parsing
+allocations = {"Measure": {}, "Dimension": {}} # {type: {operation: Int}}
+state = local() # state.operation is the Measure operator running on this thread
+lock = Lock()
+originals = {} # (owner, name) -> the original attribute, while enabled
+depth = 0 # how many instrumented() blocks are open
+
+def stats(table, key):
+    entry = table.get(key)
+    if entry is None:
+        entry = table.setdefault(key, Stats())
+    return entry
+
+def currentOperation():
+    return getattr(state, "operation", None) or "other"
+
+def count(table, key):
+    table[key] = table.get(key, 0) + 1
+
+################################################################################
+# WRAPPERS
+################################################################################
+
+def wrapOperator(name, original):
+    label = "Measure." + name
+    def wrapper(*args, **kwargs):
+        previous = getattr(state, "operation", None)
+        state.operation = label
+        start = perf_counter_ns()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            stats(operations, label).record(perf_counter_ns() - start)
+            state.operation = previous
+    wrapper.__name__ = original.__name__
+    wrapper.__doc__ = original.__doc__
+    return wrapper
+
+def wrapLookup(original):
+    def lookup(unitString):
+        start = perf_counter_ns()
+        try:
+            return original(unitString)
+        finally:
+            stats(unitLookups, unitString).record(perf_counter_ns() - start)
+    return lookup
+
+def wrapParse(original):
+    def parseUnit(unitString, resolve=None):
+        start = perf_counter_ns()
+        try:
+            return original(unitString, resolve)
+        finally:
+            stats(unitParses, unitString).record(perf_counter_ns() - start)
+    return parseUnit
+
+def wrapResolve(original):
+    def getUnitMultiplierAndDimension(unit):
+        count(registryLookups, unit)
+        return original(unit)
+    return getUnitMultiplierAndDimension
+
+def wrapFromBase(original):
+    def fromBase(cls, value, dimension):
+        count(allocations["Measure"], currentOperation())
+        return original(cls, value, dimension)
+    return classmethod(fromBase)
+
+def wrapFromExponents(original):
+    def fromExponents(exponents):
+        exponents = tuple(map(canonicalExponent, exponents))
+        if exponents not in Dimension.instances:
+            count(allocations["Dimension"], currentOperation())
+        return original(exponents)
+    return staticmethod(fromExponents)
+
+################################################################################
+# SWITCHING
+################################################################################
+
+def patch(owner, name, replacement):
+    originals[(owner, name)] = owner.__dict__[name] if isinstance(owner, type) else getattr(owner, name)
+    setattr(owner, name, replacement)
+
+def enable():
+    """
+    starts collecting; does nothing if already enabled
+    """
+    with lock:
+        if originals:
+            return
+        for name in operators:
+            patch(Measure, name, wrapOperator(name, Measure.__dict__[name]))
+        patch(Measure, "fromBase", wrapFromBase(Measure.__dict__["fromBase"].__func__))
+        patch(Dimension, "fromExponents", wrapFromExponents(Dimension.__dict__["fromExponents"].__func__))
+        patch(unitCache, "lookup", wrapLookup(unitCache.lookup))
+        patch(measureModule, "parseUnit", wrapParse(measureModule.parseUnit))
+        patch(measureModule, "getUnitMultiplierAndDimension", wrapResolve(measureModule.getUnitMultiplierAndDimension))
+
+def disable():
+    """
+    stops collecting and restores the original functions; the stats are kept
+    """
+    with lock:
+        for ((owner, name), original) in originals.items():
+            if owner is unitCache:
+                del unitCache.lookup # fall back to the method on the class
+            else:
+                setattr(owner, name, original)
+        originals.clear()
+
+def isEnabled():
+    return bool(originals)
+
+def reset():
+    """
+    forgets everything collected so far
+    """
+    operations.clear()
+    unitLookups.clear()
+    unitParses.clear()
+    registryLookups.clear()
+    for table in allocations.values():
+        table.clear()
+
+def snapshot():
+    """
+    snapshot :: () -> {String: a}
+    returns a copy of everything collected so far
+    """
+    return {
+        "operations": {name: entry.summary() for (name, entry) in operations.items()},
+        "unitLookups": {unit: entry.summary() for (unit, entry) in unitLookups.items()},
+        "unitParses": {unit: entry.summary() for (unit, entry) in unitParses.items()},
+        "registryLookups": dict(registryLookups),
+        "allocations": {kind: dict(table) for (kind, table) in allocations.items()},
+        "cache": unitCache.info(),
+    }
+
+def hottestUnits(n=10):
+    """
+    hottestUnits :: Int -> [(String, Int)]
+    returns the n most looked up unit strings and their lookup counts
+    """
+    return sorted(((unit, entry.count) for (unit, entry) in unitLookups.items()), key=lambda pair: -pair[1])[:n]
+
+@contextmanager
+def instrumented(fresh=True):
+    """
+    collects stats inside a with block
+    fresh clears the stats collected before the block
+    """
+    global depth
+    if fresh:
+        reset()
+    with lock:
+        depth += 1
+    enable()
+    try:
+        yield
+    finally:
+        with lock:
+            depth -= 1
+            last = depth == 0
+        if last:
+            disable()
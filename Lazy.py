@@ -0,0 +1,195 @@
+"""
+lazy arithmetic on measure arrays
+
+    (a, b, c, d) = lazy(pressure, area, offset, length)
+    force = (a*b + c) / d**2 # checks the dimensions, computes nothing
+    force.evaluate("kN") # runs the whole expression chunk by chunk
+
+arithmetic on lazy arrays records an expression (in the form used by Formula)
+instead of computing temporaries, checking dimensions as it goes
+evaluating it compiles the expression, with unit conversions folded into its
+constants, into one function and runs it over slices of the inputs that fit
+in cache, so memory use stays close to the inputs plus the output
+"""
+from Measure import Measure, readUnit
+from MeasureArray import MeasureArray
+from Formula import combine, negate, raisePower, render, dimensionless
+from itertools import count
+from numbers import Number
+import numpy as np
+
+defaultChunkSize = 16384 # elements per slice, small enough for the temporaries to stay in cache
+inputNumbers = count() # names the inputs of expressions
+
+class LazyArray(MeasureArray):
+    """
+    an expression over measure arrays, with its dimension and its inputs
+    its value is the expression (see Formula) instead of numbers
+    LazyArray subclasses MeasureArray so that measures and arrays combine with it here
+    """
+    __slots__ = ("inputs", "lazyShape")
+    __hash__ = None
+    
+    def __init__(self, expression, dimension, inputs, shape):
+        """
+        expression :: Expression
+        inputs :: {String: numpy.ndarray} -- the values (in base units) of each input in the expression
+        shape :: (Int...) -- of the result, None if the expression has no inputs
+        """
+        self.value = expression
+        self.dimension = dimension
+        self.inputs = inputs
+        self.lazyShape = shape
+    
+    @property
+    def shape(self):
+        return self.lazyShape
+    
+    def apply(self, operator, other, reflected=False):
+        (node, dimension, inputs, shape) = operand(other)
+        if self.lazyShape is not None and shape is not None and shape != self.lazyShape:
+            raise ValueError("cannot combine arrays of shapes {} and {}".format(self.lazyShape, shape))
+        (a, b) = ((node, dimension), (self.value, self.dimension)) if reflected else ((self.value, self.dimension), (node, dimension))
+        if operator == "+":
+            resultDimension = a[1] + b[1]
+        elif operator == "-":
+            resultDimension = a[1] - b[1]
+        elif operator == "*":
+            resultDimension = a[1] * b[1]
+        else:
+            resultDimension = a[1] / b[1]
+        return LazyArray(combine(operator, a[0], b[0]), resultDimension, {**self.inputs, **inputs}, self.lazyShape or shape)
+    
+    def __add__(self, other):
+        return self.apply("+", other)
+    
+    def __radd__(self, other):
+        return self.apply("+", other, True)
+    
+    def __sub__(self, other):
+        return self.apply("-", other)
+    
+    def __rsub__(self, other):
+        return self.apply("-", other, True)
+    
+    def __mul__(self, other):
+        return self.apply("*", other)
+    
+    def __rmul__(self, other):
+        return self.apply("*", other, True)
+    
+    def __truediv__(self, other):
+        return self.apply("/", other)
+    
+    def __rtruediv__(self, other):
+        return self.apply("/", other, True)
+    
+    def __pow__(self, power):
+        if not isinstance(power, Number):
+            raise TypeError("lazy arrays can only be raised to constant powers")
+        return LazyArray(raisePower(self.value, power), self.dimension ** power, self.inputs, self.lazyShape)
+    
+    def __pos__(self):
+        return self
+    
+    def __neg__(self):
+        return LazyArray(negate(self.value), self.dimension, self.inputs, self.lazyShape)
+    
+    # a lazy array stands for one result, so it is never changed in place
+    __iadd__ = __add__
+    __isub__ = __sub__
+    __imul__ = __mul__
+    __itruediv__ = __truediv__
+    __ipow__ = __pow__
+    
+    def unsupported(self, *args):
+        raise TypeError("evaluate the lazy array first")
+    
+    __eq__ = __ne__ = __lt__ = __le__ = __ge__ = __gt__ = __abs__ = __round__ = __trunc__ = __ceil__ = __iter__ = __bool__ = __float__ = __int__ = unsupported
+    
+    def __getitem__(self, unit):
+        """
+        with a unit string, evaluates the values in that unit
+        """
+        if not isinstance(unit, str):
+            raise TypeError("evaluate the lazy array before indexing it")
+        return self.evaluate(unit)
+    
+    def __len__(self):
+        if not self.lazyShape:
+            raise TypeError("the expression has no length")
+        return self.lazyShape[0]
+    
+    def source(self, unit=None):
+        """
+        source :: String -> String
+        returns the python source of the function evaluate runs on each slice
+        """
+        return "lambda {}: {}".format(", ".join(self.inputs), render(self.converted(unit)))
+    
+    def converted(self, unit):
+        """
+        converted :: String -> Expression
+        returns the expression giving the result in the unit (base units if None)
+        """
+        if unit is None:
+            return self.value
+        (m, d) = readUnit(unit)
+        if d is not self.dimension:
+            raise ValueError("the expression gives [{}], not \"{}\" [{}]".format(self.dimension, unit, d))
+        return combine("/", self.value, ("constant", m))
+    
+    def evaluate(self, unit=None, out=None, chunkSize=None):
+        """
+        evaluate :: String -> numpy.ndarray -> Int -> MeasureArray|numpy.ndarray
+        computes the expression chunkSize elements at a time
+        returns a MeasureArray, or plain numbers in the unit if one is given
+        if out is given the numbers are written into it (and it is returned)
+        """
+        chunkSize = chunkSize or defaultChunkSize
+        function = eval(self.source(unit), {})
+        if self.lazyShape is None: # only constants
+            value = function()
+            return Measure.fromBase(value, self.dimension) if unit is None else value
+        names = list(self.inputs)
+        flat = [self.inputs[name].reshape(-1) for name in names]
+        size = int(np.prod(self.lazyShape))
+        if out is None:
+            out = np.empty(self.lazyShape, dtype=np.result_type(*flat))
+        elif out.shape != self.lazyShape or not out.flags.c_contiguous:
+            raise ValueError("out must be a contiguous array of shape {}".format(self.lazyShape))
+        target = out.reshape(-1) # a view, since out is contiguous
+        for start in range(0, size, chunkSize):
+            stop = min(start + chunkSize, size)
+            target[start:stop] = function(*[values[start:stop] for values in flat])
+        return MeasureArray.fromBase(out, self.dimension) if unit is None else out
+    
+    def __str__(self):
+        return "LazyArray(" + render(self.value) + " [" + str(self.dimension) + "])"
+    
+    __repr__ = __str__
+
+def operand(x):
+    """
+    operand :: LazyArray|MeasureArray|Measure|Number -> (Expression, Dimension, {String: numpy.ndarray}, (Int...))
+    returns the expression, dimension, inputs and shape of something combined with a lazy array
+    """
+    if isinstance(x, LazyArray):
+        return (x.value, x.dimension, x.inputs, x.lazyShape)
+    elif isinstance(x, MeasureArray):
+        name = "a{}".format(next(inputNumbers))
+        return (("input", name), x.dimension, {name: x.value}, x.value.shape)
+    elif isinstance(x, Measure):
+        return (("constant", x.value), x.dimension, {}, None)
+    elif isinstance(x, Number):
+        return (("constant", x), dimensionless, {}, None)
+    else:
+        raise TypeError("cannot use {} in a lazy expression".format(type(x).__name__))
+
+def lazy(*arrays):
+    """
+    lazy :: MeasureArray... -> LazyArray|(LazyArray...)
+    returns the arrays as lazy arrays (just one if only one is given)
+    """
+    wrapped = tuple(LazyArray(*operand(array)) for array in arrays)
+    return wrapped[0] if len(wrapped) == 1 else wrapped
@@ -0,0 +1,237 @@
+"""
+measure arrays stored in files and memory-mapped, for data larger than memory
+
+    header: magic "PYUA", version (uint16), unit length (uint16), the multiplier
+            of the unit to base units (float64), the 8 dimension exponents
+            (float64), then the unit string (utf-8), padded to 8 bytes
+    values: float64, little-endian, in the unit of the header
+
+the values stay in the unit they were written in, so other tools can read
+them as plain numbers; they are converted when they are read through
+["unit"], and arithmetic between files builds lazy expressions (see Lazy)
+whose dimensions are checked before any value is read
+"""
+from Measure import Measure, readUnit
+from MeasureArray import MeasureArray
+from Unit import Dimension
+from Lazy import LazyArray, inputNumbers, operand
+from Formula import combine
+import numpy as np
+import struct
+import os
+
+MAGIC = b"PYUA"
+VERSION = 1
+headerFormat = struct.Struct("<4sHHd8d")
+defaultChunkSize = 65536 # values read at a time when going through a whole file
+
+class MappedMeasureArray:
+    """
+    a file of values in one unit, memory-mapped
+    """
+    __array_ufunc__ = None # make numpy defer to our reflected operators
+    
+    def __init__(self, path, writable=False):
+        """
+        opens an existing file
+        path :: String
+        writable :: Bool -- whether the values can be changed in place
+        """
+        self.path = path
+        self.writable = writable
+        with open(path, "rb") as file:
+            header = file.read(headerFormat.size)
+            if len(header) != headerFormat.size:
+                raise ValueError("\"{}\" is not a measure array file".format(path))
+            (magic, version, unitLength, self.multiplier, *exponents) = headerFormat.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("\"{}\" is not a measure array file".format(path))
+            if version != VERSION:
+                raise ValueError("unsupported measure array file version {}".format(version))
+            self.unit = file.read(unitLength).decode("utf-8")
+        self.dimension = Dimension.fromExponents(exponents)
+        self.offset = headerSize(unitLength)
+        self.map()
+    
+    @classmethod
+    def create(cls, path, unit, values=(), size=0):
+        """
+        create :: String -> String -> Iterable Number -> Int -> MappedMeasureArray
+        writes a new file holding the values (numbers in unit), or size zeros
+        returns it opened for writing
+        """
+        (m, d) = readUnit(unit)
+        encoded = unit.encode("utf-8")
+        with open(path, "wb") as file:
+            file.write(headerFormat.pack(MAGIC, VERSION, len(encoded), m, *d.exponents))
+            file.write(encoded.ljust(headerSize(len(encoded)) - headerFormat.size, b"\0"))
+            file.write(np.asarray(values, dtype="<f8").tobytes())
+            if size:
+                file.truncate(file.tell() + 8*size)
+        return cls(path, writable=True)
+    
+    def map(self):
+        count = (os.path.getsize(self.path) - self.offset) // 8
+        if count:
+            self.raw = np.memmap(self.path, dtype="<f8", mode="r+" if self.writable else "r", offset=self.offset, shape=(count,))
+        else: # an empty file cannot be mapped
+            self.raw = np.empty(0, dtype="<f8")
+    
+    def __len__(self):
+        return len(self.raw)
+    
+    @property
+    def shape(self):
+        return self.raw.shape
+    
+    def append(self, values):
+        """
+        appends values: a MeasureArray or Measure in the dimension of the file,
+        or plain numbers in the unit of the file
+        """
+        if isinstance(values, Measure):
+            if values.dimension is not self.dimension:
+                raise ValueError("cannot append [{}] to \"{}\" in [{}]".format(values.dimension, self.path, self.dimension))
+            values = np.asarray(values.value, dtype=np.float64).reshape(-1) / self.multiplier
+        data = np.asarray(values, dtype="<f8").reshape(-1)
+        if isinstance(self.raw, np.memmap):
+            self.raw.flush()
+        with open(self.path, "ab") as file:
+            file.write(data.tobytes())
+        self.map()
+    
+    def flush(self):
+        if isinstance(self.raw, np.memmap):
+            self.raw.flush()
+    
+    def __getitem__(self, key):
+        """
+        with a unit string, returns the values in that unit, converted only as they are indexed
+        with a unit string and an index (ex: arr["kPa", 1000:2000]), converts only those values
+        otherwise indexes the values into a Measure or a MeasureArray (in memory)
+        """
+        if isinstance(key, tuple) and len(key) == 2 and isinstance(key[0], str):
+            (unit, index) = key
+            return self.raw[index] * self.factor(unit)
+        if isinstance(key, str):
+            return ConvertedValues(self.raw, self.factor(key))
+        values = self.raw[key] * self.multiplier
+        if np.ndim(values) == 0:
+            return Measure.fromBase(float(values), self.dimension)
+        return MeasureArray.fromBase(values, self.dimension)
+    
+    def factor(self, unit):
+        """
+        factor :: String -> Number
+        returns the factor converting the values of the file to the unit
+        """
+        (m, d) = readUnit(unit)
+        if d is not self.dimension:
+            raise ValueError("\"{}\" in [{}] cannot be read in \"{}\" [{}]".format(self.path, self.dimension, unit, d))
+        return self.multiplier / m
+    
+    def chunks(self, unit=None, size=defaultChunkSize):
+        """
+        chunks :: String -> Int -> Iterator numpy.ndarray|MeasureArray
+        yields the values size at a time, in the unit (or as MeasureArrays)
+        """
+        for start in range(0, len(self.raw), size):
+            yield self[unit, start:start + size] if unit is not None else self[start:start + size]
+    
+    def lazy(self):
+        """
+        lazy :: () -> LazyArray
+        returns the values as a lazy array reading straight from the file
+        """
+        name = "a{}".format(next(inputNumbers))
+        return LazyArray(combine("*", ("constant", self.multiplier), ("input", name)), self.dimension, {name: self.raw}, self.raw.shape)
+    
+    # arithmetic builds lazy expressions, checking the dimensions before reading anything
+    def __add__(self, other):
+        return self.lazy() + lazyOperand(other)
+    
+    def __radd__(self, other):
+        return lazyOperand(other) + self.lazy()
+    
+    def __sub__(self, other):
+        return self.lazy() - lazyOperand(other)
+    
+    def __rsub__(self, other):
+        return lazyOperand(other) - self.lazy()
+    
+    def __mul__(self, other):
+        return self.lazy() * lazyOperand(other)
+    
+    def __rmul__(self, other):
+        return lazyOperand(other) * self.lazy()
+    
+    def __truediv__(self, other):
+        return self.lazy() / lazyOperand(other)
+    
+    def __rtruediv__(self, other):
+        return lazyOperand(other) / self.lazy()
+    
+    def __pow__(self, power):
+        return self.lazy() ** power
+    
+    def __neg__(self):
+        return -self.lazy()
+    
+    def __str__(self):
+        return "MappedMeasureArray(\"{}\", {} values in \"{}\" [{}])".format(self.path, len(self.raw), self.unit, self.dimension)
+    
+    __repr__ = __str__
+
+class ConvertedValues:
+    """
+    the values of a file in another unit, read and converted only when indexed
+        log["bar"][1000:2000] # converts 1000 values
+        np.asarray(log["bar"]) # converts them all, in memory
+    """
+    def __init__(self, raw, factor):
+        """
+        raw :: numpy.ndarray -- the values as stored in the file
+        factor :: Number -- converting them to the unit
+        """
+        self.raw = raw
+        self.factor = factor
+    
+    def __len__(self):
+        return len(self.raw)
+    
+    @property
+    def shape(self):
+        return self.raw.shape
+    
+    def __getitem__(self, index):
+        return self.raw[index] * self.factor
+    
+    def __array__(self, dtype=None, copy=None):
+        values = self.raw * self.factor
+        return values if dtype is None else values.astype(dtype, copy=False)
+    
+    def __iter__(self):
+        for start in range(0, len(self.raw), defaultChunkSize):
+            yield from (self.raw[start:start + defaultChunkSize] * self.factor).tolist()
+    
+    def __str__(self):
+        return "ConvertedValues({} values, x{})".format(len(self.raw), self.factor)
+    
+    __repr__ = __str__
+
+def lazyOperand(x):
+    """
+    lazyOperand :: MappedMeasureArray|Measure|a -> LazyArray|a
+    """
+    if isinstance(x, MappedMeasureArray):
+        return x.lazy()
+    if isinstance(x, Measure): # arrays and scalar measures, so their dimension is checked
+        return LazyArray(*operand(x))
+    return x
+
+def headerSize(unitLength):
+    """
+    headerSize :: Int -> Int
+    returns the size of the header with the unit string, rounded up to 8 bytes
+    """
+    return (headerFormat.size + unitLength + 7) // 8 * 8
@@ -1,17 +1,43 @@
 from Unit import *
 import re
 from functools import reduce
+from collections import OrderedDict
+from math import trunc, ceil
+from decimal import Decimal
+from numbers import Number
+import os
+from threading import Lock
+
+plainNumbers = (int, float, Number) # the concrete types first, so the usual operand skips the slower ABC check
 
 class Measure:
+    __slots__ = ("value", "dimension")
+    
     def __init__(self, value, unit):
         """
         value :: Number
-        dimension :: Dimension
+        unit :: String
         """
         (m, d) = readUnit(unit)
         self.value = m*value
         self.dimension = d
     
+    @classmethod
+    def fromBase(cls, value, dimension):
+        """
+        fromBase :: Number -> Dimension -> Measure
+        takes a value already in base units and its dimension
+        returns the measure without parsing any unit string
+        """
+        measure = object.__new__(cls)
+        measure.value = value
+        measure.dimension = dimension
+        return measure
+    
+    def __reduce__(self):
+        # pickle as the value and the (interned) dimension, not as a slot dict
+        return (self.__class__.fromBase, (self.value, self.dimension))
+    
     def __eq__(self, other):
         return self.value == other.value and self.dimension == other.dimension
     
@@ -39,87 +65,112 @@ class Measure:
         return self.value > other.value
     
     def __pos__(self):
-        return Measure(+self.value, self.dimension)
+        return Measure.fromBase(+self.value, self.dimension)
     
     def __neg__(self):
-        return Measure(-self.value, self.dimension)
+        return Measure.fromBase(-self.value, self.dimension)
     
     def __abs__(self):
-        return Measure(abs(self.value), self.dimension)
+        return Measure.fromBase(abs(self.value), self.dimension)
     
     def __add__(self, other):
-        return Measure(self.value + other.value, self.dimension + other.dimension)
+        if not isinstance(other, Measure):
+            return NotImplemented
+        return Measure.fromBase(self.value + other.value, self.dimension + other.dimension)
     
     def __iadd__(self, other):
+        if not isinstance(other, Measure):
+            return NotImplemented
+        self.dimension += other.dimension # check the dimensions before changing the value
         self.value += other.value
-        self.dimension += other.dimension
+        return self
     
     def __sub__(self, other):
-        return Measure(self.value - other.value, self.dimension - other.dimension)
+        if not isinstance(other, Measure):
+            return NotImplemented
+        return Measure.fromBase(self.value - other.value, self.dimension - other.dimension)
     
     def __isub__(self, other):
-        self.value -= other.value
+        if not isinstance(other, Measure):
+            return NotImplemented
         self.dimension -= other.dimension
+        self.value -= other.value
+        return self
     
     def __mul__(self, other):
         if isinstance(other, self.__class__):
-            return Measure(self.value * other.value, self.dimension * other.dimension)
+            return Measure.fromBase(self.value * other.value, self.dimension * other.dimension)
+        elif isinstance(other, plainNumbers):
+            return Measure.fromBase(self.value * other, self.dimension)
         else:
-            return Measure(self.value * other, self.dimension)
+            return NotImplemented
     
     def __rmul__(self, other):
         if isinstance(other, self.__class__):
-            return Measure(other.value * self.value, other.dimension * self.dimension)
+            return Measure.fromBase(other.value * self.value, other.dimension * self.dimension)
+        elif isinstance(other, plainNumbers):
+            return Measure.fromBase(other * self.value, self.dimension)
         else:
-            return Measure(other * self.value, self.dimension)
+            return NotImplemented
     
     def __imul__(self, other):
         if isinstance(other, self.__class__):
             self.value *= other.value
             self.dimension *= other.dimension
-        else:
+        elif isinstance(other, plainNumbers):
             self.value *= other
+        else:
+            return NotImplemented
+        return self
     
     def __truediv__(self, other):
         if isinstance(other, self.__class__):
-            return Measure(self.value / other.value, self.dimension / other.dimension)
+            return Measure.fromBase(self.value / other.value, self.dimension / other.dimension)
+        elif isinstance(other, plainNumbers):
+            return Measure.fromBase(self.value / other, self.dimension)
         else:
-            return Measure(self.value / other, self.dimension)
+            return NotImplemented
     
     def __rtruediv__(self, other):
         if isinstance(other, self.__class__):
-            return Measure(other.value / self.value, other.dimension / self.dimension)
+            return Measure.fromBase(other.value / self.value, other.dimension / self.dimension)
+        elif isinstance(other, plainNumbers):
+            return Measure.fromBase(other / self.value, self.dimension ** -1)
         else:
-            return Measure(other / self.value, 1/self.dimension)
+            return NotImplemented
     
     def __itruediv__(self, other):
         if isinstance(other, self.__class__):
             self.value /= other.value
             self.dimension /= other.dimension
-        else:
+        elif isinstance(other, plainNumbers):
             self.value /= other
+        else:
+            return NotImplemented
+        return self
     
     def __pow__(self, power):
-        return Measure(self.value ** power, str(self.dimension ** power)) # FIXME: this is a gross way to do this (going through a string representation)
+        return Measure.fromBase(self.value ** power, self.dimension ** power)
     
     def __ipow__(self, power):
         self.value **= power
         self.dimension **= power
+        return self
     
     def __int__(self):
         return self.__trunc__().value
     
-    def __float__(self, digits=None):
-        return Measure(float(self.value, digits), self.dimension)
+    def __float__(self):
+        return float(self.value)
     
-    def __round__(self):
-        return Measure(round(self.value), self.dimension)
+    def __round__(self, digits=None):
+        return Measure.fromBase(round(self.value, digits), self.dimension)
     
     def __trunc__(self):
-        return Measure(trunc(self.value), self.dimension)
+        return Measure.fromBase(trunc(self.value), self.dimension)
     
     def __ceil__(self):
-        return Measure(ceil(self.value), self.dimension)
+        return Measure.fromBase(ceil(self.value), self.dimension)
     
     def __repr__(self):
         return self.__str__()
@@ -127,6 +178,29 @@ class Measure:
     def __str__(self):
         return str(self.value) + " [" + str(self.dimension) + "]"
     
+    def __format__(self, spec):
+        """
+        format(measure, ".3f kPa") -> "12.500 kPa"
+        the spec is a number format, optionally followed by a space and one of:
+            a unit to show the value in (ex: "kPa")
+            "~" or "~system" for the best unit of a display system (see Display)
+            "^" for base units with superscript powers
+        without one the value is shown in base units followed by the dimension
+        """
+        if not spec:
+            return self.__str__()
+        (number, _, unit) = spec.partition(" ")
+        if not unit:
+            return format(self.value, number) + " [" + str(self.dimension) + "]"
+        elif unit == "^":
+            return format(self.value, number) + " [" + self.dimension.format("superscript") + "]"
+        elif unit[0] == "~":
+            from Display import simplify # only pay for it when it is used
+            (value, unit) = simplify(self, unit[1:] or "SI")
+            return format(value, number) + " " + unit
+        else:
+            return format(self[unit], number) + " " + unit
+    
     def __getitem__(self, key):
         (m, d) = readUnit(key)
         if d == self.dimension:
@@ -142,6 +216,41 @@ def readUnit(unitString):
     readUnit :: String -> (Number, Dimension)
     takes the unit as a string
     returns the multiplier to baseUnits and the dimension
+    results are memoized in unitCache
+    """
+    return unitCache.lookup(unitString)
+
+def readMeasure(text):
+    """
+    readMeasure :: String -> Measure
+    takes a value and its unit separated by whitespace, ex: "12.5 km"
+    returns the measure
+    """
+    (value, unit) = text.split(None, 1)
+    return Measure(float(value), unit.strip())
+
+def parseUnit(unitString, resolve=None):
+    """
+    parseUnit :: String -> (String -> (Number, Dimension)) -> (Number, Dimension)
+    takes the unit as a string and optionally a function resolving single unit names
+    returns the multiplier to baseUnits and the dimension, without consulting the cache
+    """
+    resolve = resolve or getUnitMultiplierAndDimension
+    # match with multipliers
+    terms = readUnitTerms(unitString)
+    if not terms:
+        raise ValueError("\"{}\" has no units in it".format(unitString))
+    unitStats = [(resolve(u), p) for (u, p) in terms] # [((multiplier, Dimension), power)]
+    unitStats = [(m**p, d**p) for ((m, d), p) in unitStats] # apply power to multiplier and dimension
+    # multiply together all the multipliers and dimensions
+    x = reduce(lambda a, b: (a[0] * b[0], a[1] * b[1]), unitStats)
+    return x
+
+def readUnitTerms(unitString):
+    """
+    readUnitTerms :: String -> [(String, Number)]
+    takes the unit as a string
+    returns the unit names and powers it is made of
     """
     # TODO: make it work with powers of rational numbers. ex: "m^(1/2)"
     # split by "/"
@@ -156,13 +265,9 @@ def readUnit(unitString):
     # split by "^" or read "²"
     topUnits = [readDimensionTerm(term) for term in topTerms]
     bottomUnits = [readDimensionTerm(term) for term in bottomTerms]
-    units = topUnits + [(u, -p) for (u, p) in bottomUnits]
-    # match with multipliers
-    unitStats = [(getUnitMultiplierAndDimension(u), p) for (u, p) in units] # [((multiplier, Dimension), power)]
-    unitStats = [(m**p, d**p) for ((m, d), p) in unitStats] # apply power to multiplier and dimension
-    # multiply together all the multipliers and dimensions
-    x = reduce(lambda a, b: (a[0] * b[0], a[1] * b[1]), unitStats)
-    return x
+    return topUnits + [(u, -p) for (u, p) in bottomUnits]
+
+unitName = re.compile(r"([a-zA-Zα-ωΑ-Ω]|°|Å)+") # the characters unit names are made of
 
 def readDimensionTerm(term):
     """
@@ -171,7 +276,7 @@ def readDimensionTerm(term):
     returns the unit string ("kg") and the power (2)
     """
     # split term string into the unit and the power
-    unit = re.match(r"([a-zA-Zα-ωΑ-Ω]|°|Å)+", term).group(0)
+    unit = unitName.match(term).group(0)
     rest = term.lstrip(unit)
     # disect the power to get the number
     if rest == "": # no power written
@@ -189,21 +294,257 @@ def getUnitMultiplierAndDimension(unit):
     takes the unit string
     returns the multiplier to base units and the dimension of that unit
     """
-    # get the associated multiplier and dimension or unit
-    (m, d) = units[unit]
-    # test if it returned a reference unit
-    if isinstance(d, str): # if it returned a string
-        (nm, nd) = readUnit(d)
-        return (m*nm, nd)
-    else:
-        return (m, d)
+    return resolveUnit(compiledUnits, unit)
+
+def resolveUnit(compiled, unit):
+    """
+    resolveUnit :: {String: (Number, Dimension)} -> String -> (Number, Dimension)
+    looks the unit up in a compiled table, resolving prefixed units and
+    remembering them in the table for next time
+    raises KeyError if the unit is unknown
+    """
+    try:
+        return compiled[unit]
+    except KeyError:
+        pass
+    split = splitPrefix(unit)
+    if split is None:
+        raise KeyError(unit)
+    (prefix, base) = split
+    (m, d) = compiled[base]
+    result = compiled[unit] = (applyPrefix(prefix, m), d)
+    return result
+
+def splitPrefix(unit):
+    """
+    splitPrefix :: String -> (String, String) | None
+    takes a unit string like "kWb" or "mL"
+    returns the SI prefix and the prefixable unit it is made of, or None
+    longer prefixes are tried first, so "dam" is a decameter
+    """
+    for prefix in prefixOrder:
+        if unit.startswith(prefix) and unit[len(prefix):] in prefixableUnits:
+            return (prefix, unit[len(prefix):])
+    return None
+
+def applyPrefix(prefix, multiplier):
+    """
+    applyPrefix :: String -> Number -> Number
+    returns the multiplier scaled by the prefix, rounded once (so "ng" is exactly 1e-12 kg)
+    """
+    return float(Decimal(repr(multiplier)).scaleb(prefixes[prefix]))
+
+def compileUnits(table):
+    """
+    compileUnits :: {String: (Number, Dimension|String)} -> {String: (Number, Dimension)}
+    takes a units table whose entries may reference other units
+    returns a table with every entry resolved to base units
+    raises ValueError on reference loops, references to unknown units and unreadable definitions
+    """
+    compiled = {}
+    path = [] # the chain of units currently being resolved
+    
+    def resolve(unit):
+        if unit in compiled:
+            return compiled[unit]
+        if unit in path:
+            loop = path[path.index(unit):] + [unit]
+            raise ValueError("unit reference loop: " + " -> ".join(loop))
+        if unit not in table:
+            split = splitPrefix(unit)
+            if split is None:
+                raise ValueError("unknown unit \"{}\" referenced by \"{}\"".format(unit, path[-1]))
+            (prefix, base) = split
+            (m, d) = resolve(base)
+            compiled[unit] = (applyPrefix(prefix, m), d)
+            return compiled[unit]
+        (m, d) = table[unit]
+        if isinstance(d, str): # if it references other units
+            try:
+                readable = bool(readUnitTerms(d))
+            except (ValueError, KeyError, AttributeError, TypeError):
+                readable = False
+            if not readable:
+                raise ValueError("cannot read the definition of unit \"{}\": \"{}\"".format(unit, d))
+            path.append(unit)
+            (nm, nd) = parseUnit(d, resolve)
+            path.pop()
+            compiled[unit] = (m*nm, nd)
+        else:
+            compiled[unit] = (m, d)
+        return compiled[unit]
+    
+    for unit in table:
+        resolve(unit)
+    return compiled
+
+def reloadUnits():
+    """
+    recompiles the units table and clears the unit cache
+    call this after changing the units table
+    """
+    global compiledUnits
+    compiledUnits = compileUnitTable()
+    unitCache.clear()
+
+def compileUnitTable():
+    """
+    compileUnitTable :: () -> {String: (Number, Dimension)}
+    compiles the units table
+    if PYUNITS_SNAPSHOT names a file, the table is loaded lazily from that
+    memory-mapped snapshot instead, which is rewritten whenever the table changes
+    """
+    path = os.environ.get("PYUNITS_SNAPSHOT")
+    if path:
+        from Snapshot import loadCompiledUnits # only pay for it when it is used
+        return loadCompiledUnits(units, compileUnits, path)
+    return compileUnits(units)
+
+################################################################################
+# UNIT CACHE
+################################################################################
+
+class UnitCache:
+    """
+    bounded LRU cache from unit strings to their (multiplier, Dimension)
+    spellings that resolve to the same unit (ex: "kg*m/s^2", "m*kg/s^2" and "N")
+    share one canonical result, so the cache holds one result per distinct unit
+    hits take no lock; misses and clearing are serialized, and a result parsed
+    while the cache was cleared is returned but not kept, since it may be stale
+    (the hit and miss counters are approximate under threads)
+    """
+    def __init__(self, maxsize=256, parse=None):
+        """
+        maxsize :: Int -- the most unit strings to remember
+        parse :: String -> (Number, Dimension) -- parses a unit string on a miss, parseUnit by default
+        """
+        self.maxsize = maxsize
+        self.parse = parse
+        self.entries = OrderedDict() # {unitString: (multiplier, Dimension)}
+        self.canonical = {} # {canonicalKey: [(multiplier, Dimension), referenceCount]}
+        self.hits = 0
+        self.misses = 0
+        self.version = 0 # counts the clears
+        self.lock = Lock()
+    
+    def lookup(self, unitString):
+        """
+        lookup :: String -> (Number, Dimension)
+        returns the cached result for the unit string, parsing it on a miss
+        """
+        try:
+            result = self.entries[unitString]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            try:
+                self.entries.move_to_end(unitString)
+            except KeyError: # evicted by another thread meanwhile
+                pass
+            return result
+        self.misses += 1
+        version = self.version
+        result = (self.parse or parseUnit)(unitString)
+        return self.store(unitString, result, version)
+    
+    def store(self, unitString, result, version=None):
+        """
+        store :: String -> (Number, Dimension) -> Int -> (Number, Dimension)
+        caches a result parsed elsewhere (ex: on a worker thread)
+        if version is given and the cache was cleared since it was read, the
+        result is not kept
+        returns the canonical result
+        """
+        with self.lock:
+            if version is not None and version != self.version:
+                return result
+            if unitString in self.entries:
+                return self.entries[unitString]
+            result = self.share(result)
+            self.entries[unitString] = result
+            if len(self.entries) > self.maxsize:
+                (_, evicted) = self.entries.popitem(last=False)
+                self.release(evicted)
+            return result
+    
+    def share(self, result):
+        """
+        share :: (Number, Dimension) -> (Number, Dimension)
+        returns the canonical result equal to the given one
+        """
+        key = canonicalKey(result)
+        entry = self.canonical.get(key)
+        if entry is None:
+            entry = self.canonical[key] = [result, 0]
+        entry[1] += 1
+        return entry[0]
+    
+    def release(self, result):
+        """
+        drops one reference to a canonical result, forgetting it when unused
+        """
+        key = canonicalKey(result)
+        entry = self.canonical[key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self.canonical[key]
+    
+    def clear(self):
+        """
+        forgets every cached unit and resets the counters
+        reloadUnits does this after recompiling the units table
+        """
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+            self.canonical.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def info(self):
+        """
+        info :: () -> {String: Int}
+        returns the hit and miss counters and the size of the cache
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "canonical": len(self.canonical), "maxsize": self.maxsize}
+    
+    def __contains__(self, unitString):
+        return unitString in self.entries
+    
+    def __len__(self):
+        return len(self.entries)
+
+def canonicalKey(result):
+    """
+    canonicalKey :: (Number, Dimension) -> Hashable
+    returns a key that is equal for all results describing the same unit
+    """
+    return result # dimensions are interned, so the result itself is the key
+
+unitCache = UnitCache()
 
 unitPowerReplacements = {"⁰": "0", "¹": "1", "²": "2", "³": "3", "⁴": "4", "⁵": "5", "⁶": "6", "⁷": "7", "⁸": "8", "⁹": "9"}
 
+# prefixes :: {prefix: power of ten}
+prefixes = {"Y": 24, "Z": 21, "E": 18, "P": 15, "T": 12, "G": 9, "M": 6, "k": 3, "h": 2, "da": 1, "d": -1, "c": -2, "m": -3, "μ": -6, "n": -9, "p": -12, "f": -15, "a": -18, "z": -21, "y": -24}
+
+prefixOrder = sorted(prefixes, key=len, reverse=True)
+
+# prefixableUnits :: {unit}
+# the units that take SI prefixes (ex: "kWb", "mL"), see splitPrefix and resolveUnit
+prefixableUnits = {"m", "g", "s", "A", "K", "mol", "cd", "L", "Hz", "N", "Pa", "J", "W", "C", "V", "Ω", "F", "S", "Wb", "T", "G", "Gs", "H"}
+
 # units :: {unit: (multiplier, dimension|unitstring)}
-# !!!: be sure this does not have any unit reference loops
+# reference loops and unknown references are reported by compileUnits
 # specify all single-instance unit strings (all compound units are defined using
 # a reference to other units in this list)
+# prefixed units are not listed, they are derived from prefixes and prefixableUnits
+# an entry listed here always wins over reading it as a prefixed unit:
+#   "Gs" is the gauss, not a gigasecond
+#   "min" is the minute, "nmi" the nautical mile and "pc" the parsec
+#   "cd" is the candela and "cc" the cubic centimeter
+# prefixed units that only have one reading need no entry (ex: "as" is the attosecond)
 units = {
     # Base SI
     
@@ -217,27 +558,6 @@ units = {
     "rad": (1, Dimension(angle=1)),
     
     # Length
-    "Ym": (1e24, "m"),
-    "Zm": (1e21, "m"),
-    "Em": (1e18, "m"),
-    "Pm": (1e15, "m"),
-    "Tm": (1e12, "m"),
-    "Gm": (1e9, "m"),
-    "Mm": (1e6, "m"),
-    "km": (1e3, "m"),
-    "hm": (1e2, "m"),
-    "dam": (1e1, "m"),
-    "dm": (1e-1, "m"),
-    "cm": (1e-2, "m"),
-    "mm": (1e-3, "m"),
-    "μm": (1e-6, "m"),
-    "nm": (1e-9, "m"),
-    "pm": (1e-12, "m"),
-    "fm": (1e-15, "m"),
-    "am": (1e-18, "m"),
-    "zm": (1e-21, "m"),
-    "ym": (1e-24, "m"),
-    
     "Å": (1e-10, "m"),
     "in": (0.0254, "m"),
     "ft": (12, "in"),
@@ -250,54 +570,13 @@ units = {
     "ftm": (72, "in"),
     
     # Mass
-    "Yg": (1e21, "kg"),
-    "Zg": (1e18, "kg"),
-    "Eg": (1e15, "kg"),
-    "Pg": (1e12, "kg"),
-    "Tg": (1e9, "kg"),
-    "Gg": (1e6, "kg"),
-    "Mg": (1e3, "kg"),
-    "hg": (1e-1, "kg"),
-    "dag": (1e-2, "kg"),
     "g": (1e-3, "kg"),
-    "dg": (1e-4, "kg"),
-    "cg": (1e-5, "kg"),
-    "mg": (1e-6, "kg"),
-    "μg": (1e-9, "kg"),
-    "ng": (1e-12, "kg"),
-    "pg": (1e-15, "kg"),
-    "fg": (1e-18, "kg"),
-    "ag": (1e-21, "kg"),
-    "zg": (1e-24, "kg"),
-    "yg": (1e-27, "kg"),
-    
     "oz": (35.274, "kg"),
     "lbm": (2.20462, "kg"),
     "st": (0.157473, "kg"),
     "slug": (1, "lbf*s^2/ft"),
     
     # Time
-    "Ys": (1e24, "s"),
-    "Zs": (1e21, "s"),
-    "Es": (1e18, "s"),
-    "Ps": (1e15, "s"),
-    "Ts": (1e12, "s"),
-    "Gs": (1e9, "s"),
-    "Ms": (1e6, "s"),
-    "ks": (1e3, "s"),
-    "hs": (1e2, "s"),
-    "das": (1e1, "s"),
-    "ds": (1e-1, "s"),
-    "cs": (1e-2, "s"),
-    "ms": (1e-3, "s"),
-    "μs": (1e-6, "s"),
-    "ns": (1e-9, "s"),
-    "ps": (1e-12, "s"),
-    "fs": (1e-15, "s"),
-    "as": (1e-18, "s"),
-    "zs": (1e-21, "s"),
-    "ys": (1e-24, "s"),
-    
     "min": (60, "s"),
     "hr": (60, "min"),
     "day": (24, "hr"),
@@ -306,96 +585,9 @@ units = {
     "weeks": (7, "day"),
     
     # Temperature
-    "YK": (1e24, "K"),
-    "ZK": (1e21, "K"),
-    "EK": (1e18, "K"),
-    "PK": (1e15, "K"),
-    "TK": (1e12, "K"),
-    "GK": (1e9, "K"),
-    "MK": (1e6, "K"),
-    "kK": (1e3, "K"),
-    "hK": (1e2, "K"),
-    "daK": (1e1, "K"),
-    "dK": (1e-1, "K"),
-    "cK": (1e-2, "K"),
-    "mK": (1e-3, "K"),
-    "μK": (1e-6, "K"),
-    "nK": (1e-9, "K"),
-    "pK": (1e-12, "K"),
-    "fK": (1e-15, "K"),
-    "aK": (1e-18, "K"),
-    "zK": (1e-21, "K"),
-    "yK": (1e-24, "K"),
-    
     "degR": (5/9, "K"),
     "°R": (5/9, "K"),
     
-    # Current
-    "YA": (1e24, "A"),
-    "ZA": (1e21, "A"),
-    "EA": (1e18, "A"),
-    "PA": (1e15, "A"),
-    "TA": (1e12, "A"),
-    "GA": (1e9, "A"),
-    "MA": (1e6, "A"),
-    "kA": (1e3, "A"),
-    "hA": (1e2, "A"),
-    "daA": (1e1, "A"),
-    "dA": (1e-1, "A"),
-    "cA": (1e-2, "A"),
-    "mA": (1e-3, "A"),
-    "μA": (1e-6, "A"),
-    "nA": (1e-9, "A"),
-    "pA": (1e-12, "A"),
-    "fA": (1e-15, "A"),
-    "aA": (1e-18, "A"),
-    "zA": (1e-21, "A"),
-    "yA": (1e-24, "A"),
-    
-    # Amount of Substance
-    "Ymol": (1e24, "mol"),
-    "Zmol": (1e21, "mol"),
-    "Emol": (1e18, "mol"),
-    "Pmol": (1e15, "mol"),
-    "Tmol": (1e12, "mol"),
-    "Gmol": (1e9, "mol"),
-    "Mmol": (1e6, "mol"),
-    "kmol": (1e3, "mol"),
-    "hmol": (1e2, "mol"),
-    "damol": (1e1, "mol"),
-    "dmol": (1e-1, "mol"),
-    "cmol": (1e-2, "mol"),
-    "mmol": (1e-3, "mol"),
-    "μmol": (1e-6, "mol"),
-    "nmol": (1e-9, "mol"),
-    "pmol": (1e-12, "mol"),
-    "fmol": (1e-15, "mol"),
-    "amol": (1e-18, "mol"),
-    "zmol": (1e-21, "mol"),
-    "ymol": (1e-24, "mol"),
-    
-    # Luminous Intensity
-    "Ycd": (1e24, "cd"),
-    "Zcd": (1e21, "cd"),
-    "Ecd": (1e18, "cd"),
-    "Pcd": (1e15, "cd"),
-    "Tcd": (1e12, "cd"),
-    "Gcd": (1e9, "cd"),
-    "Mcd": (1e6, "cd"),
-    "kcd": (1e3, "cd"),
-    "hcd": (1e2, "cd"),
-    "dacd": (1e1, "cd"),
-    "dcd": (1e-1, "cd"),
-    "ccd": (1e-2, "cd"),
-    "mcd": (1e-3, "cd"),
-    "μcd": (1e-6, "cd"),
-    "ncd": (1e-9, "cd"),
-    "pcd": (1e-12, "cd"),
-    "fcd": (1e-15, "cd"),
-    "acd": (1e-18, "cd"),
-    "zcd": (1e-21, "cd"),
-    "ycd": (1e-24, "cd"),
-    
     # Angle
     "rev": (6.28318530718, "rad"),
     
@@ -408,8 +600,7 @@ units = {
     "acres": (4840, "yd^2"),
     
     # Volume
-    "L": (1000, "m^3"),
-    # TODO: do prefixes for L
+    "L": (1e-3, "m^3"),
     "cc": (1, "cm^3"),
     "barrel": (0.158987294928, "m^3"),
     "barrels": (0.158987294928, "m^3"),
@@ -419,364 +610,50 @@ units = {
     # Frequency
     "Hz": (1, "1/s"),
     
-    "YHz": (1e24, "Hz"),
-    "ZHz": (1e21, "Hz"),
-    "EHz": (1e18, "Hz"),
-    "PHz": (1e15, "Hz"),
-    "THz": (1e12, "Hz"),
-    "GHz": (1e9, "Hz"),
-    "MHz": (1e6, "Hz"),
-    "kHz": (1e3, "Hz"),
-    "hHz": (1e2, "Hz"),
-    "daHz": (1e1, "Hz"),
-    "dHz": (1e-1, "Hz"),
-    "cHz": (1e-2, "Hz"),
-    "mHz": (1e-3, "Hz"),
-    "μHz": (1e-6, "Hz"),
-    "nHz": (1e-9, "Hz"),
-    "pHz": (1e-12, "Hz"),
-    "fHz": (1e-15, "Hz"),
-    "aHz": (1e-18, "Hz"),
-    "zHz": (1e-21, "Hz"),
-    "yHz": (1e-24, "Hz"),
-    
     # Force
     "N": (1, "kg*m/s^2"),
-    
-    "YN": (1e24, "N"),
-    "ZN": (1e21, "N"),
-    "EN": (1e18, "N"),
-    "PN": (1e15, "N"),
-    "TN": (1e12, "N"),
-    "GN": (1e9, "N"),
-    "MN": (1e6, "N"),
-    "kN": (1e3, "N"),
-    "hN": (1e2, "N"),
-    "daN": (1e1, "N"),
-    "dN": (1e-1, "N"),
-    "cN": (1e-2, "N"),
-    "mN": (1e-3, "N"),
-    "μN": (1e-6, "N"),
-    "nN": (1e-9, "N"),
-    "pN": (1e-12, "N"),
-    "fN": (1e-15, "N"),
-    "aN": (1e-18, "N"),
-    "zN": (1e-21, "N"),
-    "yN": (1e-24, "N"),
-    
     "lbf": (4.44822, "N"),
     
     # Pressure
     "Pa": (1, "N/m^2"),
-    
-    "YPa": (1e24, "Pa"),
-    "ZPa": (1e21, "Pa"),
-    "EPa": (1e18, "Pa"),
-    "PPa": (1e15, "Pa"),
-    "TPa": (1e12, "Pa"),
-    "GPa": (1e9, "Pa"),
-    "MPa": (1e6, "Pa"),
-    "kPa": (1e3, "Pa"),
-    "hPa": (1e2, "Pa"),
-    "daPa": (1e1, "Pa"),
-    "dPa": (1e-1, "Pa"),
-    "cPa": (1e-2, "Pa"),
-    "mPa": (1e-3, "Pa"),
-    "μPa": (1e-6, "Pa"),
-    "nPa": (1e-9, "Pa"),
-    "pPa": (1e-12, "Pa"),
-    "fPa": (1e-15, "Pa"),
-    "aPa": (1e-18, "Pa"),
-    "zPa": (1e-21, "Pa"),
-    "yPa": (1e-24, "Pa"),
-    
     "bar": (1e5, "Pa"),
     "atm": (101325, "Pa"),
     
     # Energy
     "J": (1, "N*m"),
     
-    "YJ": (1e24, "J"),
-    "ZJ": (1e21, "J"),
-    "EJ": (1e18, "J"),
-    "PJ": (1e15, "J"),
-    "TJ": (1e12, "J"),
-    "GJ": (1e9, "J"),
-    "MJ": (1e6, "J"),
-    "kJ": (1e3, "J"),
-    "hJ": (1e2, "J"),
-    "daJ": (1e1, "J"),
-    "dJ": (1e-1, "J"),
-    "cJ": (1e-2, "J"),
-    "mJ": (1e-3, "J"),
-    "μJ": (1e-6, "J"),
-    "nJ": (1e-9, "J"),
-    "pJ": (1e-12, "J"),
-    "fJ": (1e-15, "J"),
-    "aJ": (1e-18, "J"),
-    "zJ": (1e-21, "J"),
-    "yJ": (1e-24, "J"),
-    
     # Power
     "W": (1, "J/s"),
     
-    "YW": (1e24, "W"),
-    "ZW": (1e21, "W"),
-    "EW": (1e18, "W"),
-    "PW": (1e15, "W"),
-    "TW": (1e12, "W"),
-    "GW": (1e9, "W"),
-    "MW": (1e6, "W"),
-    "kW": (1e3, "W"),
-    "hW": (1e2, "W"),
-    "daW": (1e1, "W"),
-    "dW": (1e-1, "W"),
-    "cW": (1e-2, "W"),
-    "mW": (1e-3, "W"),
-    "μW": (1e-6, "W"),
-    "nW": (1e-9, "W"),
-    "pW": (1e-12, "W"),
-    "fW": (1e-15, "W"),
-    "aW": (1e-18, "W"),
-    "zW": (1e-21, "W"),
-    "yW": (1e-24, "W"),
-    
     # Angular Velocity
     "RPM": (1, "rev/min"),
     
     # Charge
     "C": (1, "A*s"),
     
-    "YC": (1e24, "C"),
-    "ZC": (1e21, "C"),
-    "EC": (1e18, "C"),
-    "PC": (1e15, "C"),
-    "TC": (1e12, "C"),
-    "GC": (1e9, "C"),
-    "MC": (1e6, "C"),
-    "kC": (1e3, "C"),
-    "hC": (1e2, "C"),
-    "daC": (1e1, "C"),
-    "dC": (1e-1, "C"),
-    "cC": (1e-2, "C"),
-    "mC": (1e-3, "C"),
-    "μC": (1e-6, "C"),
-    "nC": (1e-9, "C"),
-    "pC": (1e-12, "C"),
-    "fC": (1e-15, "C"),
-    "aC": (1e-18, "C"),
-    "zC": (1e-21, "C"),
-    "yC": (1e-24, "C"),
-    
     # Voltage
     "V": (1, "J/C"),
     
-    "YV": (1e24, "V"),
-    "ZV": (1e21, "V"),
-    "EV": (1e18, "V"),
-    "PV": (1e15, "V"),
-    "TV": (1e12, "V"),
-    "GV": (1e9, "V"),
-    "MV": (1e6, "V"),
-    "kV": (1e3, "V"),
-    "hV": (1e2, "V"),
-    "daV": (1e1, "V"),
-    "dV": (1e-1, "V"),
-    "cV": (1e-2, "V"),
-    "mV": (1e-3, "V"),
-    "μV": (1e-6, "V"),
-    "nV": (1e-9, "V"),
-    "pV": (1e-12, "V"),
-    "fV": (1e-15, "V"),
-    "aV": (1e-18, "V"),
-    "zV": (1e-21, "V"),
-    "yV": (1e-24, "V"),
-    
     # Resistance
     "Ω": (1, "V/A"),
     
-    "YΩ": (1e24, "Ω"),
-    "ZΩ": (1e21, "Ω"),
-    "EΩ": (1e18, "Ω"),
-    "PΩ": (1e15, "Ω"),
-    "TΩ": (1e12, "Ω"),
-    "GΩ": (1e9, "Ω"),
-    "MΩ": (1e6, "Ω"),
-    "kΩ": (1e3, "Ω"),
-    "hΩ": (1e2, "Ω"),
-    "daΩ": (1e1, "Ω"),
-    "dΩ": (1e-1, "Ω"),
-    "cΩ": (1e-2, "Ω"),
-    "mΩ": (1e-3, "Ω"),
-    "μΩ": (1e-6, "Ω"),
-    "nΩ": (1e-9, "Ω"),
-    "pΩ": (1e-12, "Ω"),
-    "fΩ": (1e-15, "Ω"),
-    "aΩ": (1e-18, "Ω"),
-    "zΩ": (1e-21, "Ω"),
-    "yΩ": (1e-24, "Ω"),
-    
     # Capacitance
     "F": (1, "C/V"),
     
-    "YF": (1e24, "F"),
-    "ZF": (1e21, "F"),
-    "EF": (1e18, "F"),
-    "PF": (1e15, "F"),
-    "TF": (1e12, "F"),
-    "GF": (1e9, "F"),
-    "MF": (1e6, "F"),
-    "kF": (1e3, "F"),
-    "hF": (1e2, "F"),
-    "daF": (1e1, "F"),
-    "dF": (1e-1, "F"),
-    "cF": (1e-2, "F"),
-    "mF": (1e-3, "F"),
-    "μF": (1e-6, "F"),
-    "nF": (1e-9, "F"),
-    "pF": (1e-12, "F"),
-    "fF": (1e-15, "F"),
-    "aF": (1e-18, "F"),
-    "zF": (1e-21, "F"),
-    "yF": (1e-24, "F"),
-    
     # Conductance
     "S": (1, "1/Ω"),
     
-    "YS": (1e24, "S"),
-    "ZS": (1e21, "S"),
-    "ES": (1e18, "S"),
-    "PS": (1e15, "S"),
-    "TS": (1e12, "S"),
-    "GS": (1e9, "S"),
-    "MS": (1e6, "S"),
-    "kS": (1e3, "S"),
-    "hS": (1e2, "S"),
-    "daS": (1e1, "S"),
-    "dS": (1e-1, "S"),
-    "cS": (1e-2, "S"),
-    "mS": (1e-3, "S"),
-    "μS": (1e-6, "S"),
-    "nS": (1e-9, "S"),
-    "pS": (1e-12, "S"),
-    "fS": (1e-15, "S"),
-    "aS": (1e-18, "S"),
-    "zS": (1e-21, "S"),
-    "yS": (1e-24, "S"),
-    
     # Magentic Flux
     "Wb": (1, "V*s"),
     
-    "YWb": (1e24, "Wb"),
-    "ZWb": (1e21, "Wb"),
-    "EWb": (1e18, "Wb"),
-    "PWb": (1e15, "Wb"),
-    "TWb": (1e12, "Wb"),
-    "GWb": (1e9, "Wb"),
-    "MWb": (1e6, "Wb"),
-    "kWb": (1e3, "Wb"),
-    "hWb": (1e2, "Wb"),
-    "daWb": (1e1, "Wb"),
-    "dWb": (1e-1, "Wb"),
-    "cWb": (1e-2, "Wb"),
-    "mWb": (1e-3, "Wb"),
-    "μWb": (1e-6, "Wb"),
-    "nWb": (1e-9, "Wb"),
-    "pWb": (1e-12, "Wb"),
-    "fWb": (1e-15, "Wb"),
-    "aWb": (1e-18, "Wb"),
-    "zWb": (1e-21, "Wb"),
-    "yWb": (1e-24, "Wb"),
-    
     # Magnetic Flux Density
     "T": (1, "Wb/m^2"),
     "G": (1e-4, "T"),
     "Gs": (1e-4, "T"),
     
-    "YT": (1e24, "T"),
-    "ZT": (1e21, "T"),
-    "ET": (1e18, "T"),
-    "PT": (1e15, "T"),
-    "TT": (1e12, "T"),
-    "GT": (1e9, "T"),
-    "MT": (1e6, "T"),
-    "kT": (1e3, "T"),
-    "hT": (1e2, "T"),
-    "daT": (1e1, "T"),
-    "dT": (1e-1, "T"),
-    "cT": (1e-2, "T"),
-    "mT": (1e-3, "T"),
-    "μT": (1e-6, "T"),
-    "nT": (1e-9, "T"),
-    "pT": (1e-12, "T"),
-    "fT": (1e-15, "T"),
-    "aT": (1e-18, "T"),
-    "zT": (1e-21, "T"),
-    "yT": (1e-24, "T"),
-    
-    "YG": (1e24, "G"),
-    "ZG": (1e21, "G"),
-    "EG": (1e18, "G"),
-    "PG": (1e15, "G"),
-    "TG": (1e12, "G"),
-    "GG": (1e9, "G"),
-    "MG": (1e6, "G"),
-    "kG": (1e3, "G"),
-    "hG": (1e2, "G"),
-    "daG": (1e1, "G"),
-    "dG": (1e-1, "G"),
-    "cG": (1e-2, "G"),
-    "mG": (1e-3, "G"),
-    "μG": (1e-6, "G"),
-    "nG": (1e-9, "G"),
-    "pG": (1e-12, "G"),
-    "fG": (1e-15, "G"),
-    "aG": (1e-18, "G"),
-    "zG": (1e-21, "G"),
-    "yG": (1e-24, "G"),
-    
-    "YGs": (1e24, "Gs"),
-    "ZGs": (1e21, "Gs"),
-    "EGs": (1e18, "Gs"),
-    "PGs": (1e15, "Gs"),
-    "TGs": (1e12, "Gs"),
-    "GGs": (1e9, "Gs"),
-    "MGs": (1e6, "Gs"),
-    "kGs": (1e3, "Gs"),
-    "hGs": (1e2, "Gs"),
-    "daGs": (1e1, "Gs"),
-    "dGs": (1e-1, "Gs"),
-    "cGs": (1e-2, "Gs"),
-    "mGs": (1e-3, "Gs"),
-    "μGs": (1e-6, "Gs"),
-    "nGs": (1e-9, "Gs"),
-    "pGs": (1e-12, "Gs"),
-    "fGs": (1e-15, "Gs"),
-    "aGs": (1e-18, "Gs"),
-    "zGs": (1e-21, "Gs"),
-    "yGs": (1e-24, "Gs"),
-    
     # Inductance
     "H": (1, "Wb/A"),
-    
-    "YH": (1e24, "H"),
-    "ZH": (1e21, "H"),
-    "EH": (1e18, "H"),
-    "PH": (1e15, "H"),
-    "TH": (1e12, "H"),
-    "GH": (1e9, "H"),
-    "MH": (1e6, "H"),
-    "kH": (1e3, "H"),
-    "hH": (1e2, "H"),
-    "daH": (1e1, "H"),
-    "dH": (1e-1, "H"),
-    "cH": (1e-2, "H"),
-    "mH": (1e-3, "H"),
-    "μH": (1e-6, "H"),
-    "nH": (1e-9, "H"),
-    "pH": (1e-12, "H"),
-    "fH": (1e-15, "H"),
-    "aH": (1e-18, "H"),
-    "zH": (1e-21, "H"),
-    "yH": (1e-24, "H"),
     }
+
+# compiledUnits :: {unit: (multiplier, dimension)}
+compiledUnits = compileUnitTable()
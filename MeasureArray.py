@@ -0,0 +1,213 @@
+from Measure import Measure, readUnit
+import numpy as np
+from numbers import Number
+
+scalars = (int, float, np.ndarray, Number) # what arrays multiply and divide by, concrete types first
+
+class MeasureArray(Measure):
+    """
+    many values sharing one dimension
+    the values are kept in base units in a contiguous numpy buffer, so every
+    operation checks the dimension once instead of once per element
+    MeasureArray subclasses Measure so that mixed expressions like
+    Measure * MeasureArray are handled here and return arrays
+    """
+    __slots__ = ()
+    __array_ufunc__ = None # make numpy defer to our reflected operators
+    __hash__ = None
+    
+    def __init__(self, values, unit, dtype=np.float64):
+        """
+        values :: Iterable Number
+        unit :: String
+        dtype :: numpy.dtype -- float64 by default, float32 to halve the memory
+        """
+        (m, d) = readUnit(unit)
+        self.value = np.array(values, dtype=dtype)
+        self.value *= m
+        self.dimension = d
+    
+    @classmethod
+    def fromMeasures(cls, measures, dtype=np.float64):
+        """
+        fromMeasures :: [Measure] -> MeasureArray
+        takes measures that all have the same dimension
+        returns them packed into one array
+        """
+        measures = list(measures)
+        if not measures:
+            raise ValueError("cannot infer the dimension of an empty list of measures")
+        dimension = measures[0].dimension
+        if any(m.dimension is not dimension for m in measures):
+            raise ValueError("cannot pack measures with different dimensions")
+        return cls.fromBase(np.fromiter((m.value for m in measures), dtype=dtype, count=len(measures)), dimension)
+    
+    def __eq__(self, other):
+        return (self.value == other.value) & (self.dimension == other.dimension)
+    
+    def __ne__(self, other):
+        return ~(self == other)
+    
+    def __lt__(self, other):
+        if self.dimension != other.dimension:
+            raise ValueError("cannot compare measures with different dimensions")
+        return self.value < other.value
+    
+    def __le__(self, other):
+        if self.dimension != other.dimension:
+            raise ValueError("cannot compare measures with different dimensions")
+        return self.value <= other.value
+    
+    def __ge__(self, other):
+        if self.dimension != other.dimension:
+            raise ValueError("cannot compare measures with different dimensions")
+        return self.value >= other.value
+    
+    def __gt__(self, other):
+        if self.dimension != other.dimension:
+            raise ValueError("cannot compare measures with different dimensions")
+        return self.value > other.value
+    
+    def __pos__(self):
+        return MeasureArray.fromBase(+self.value, self.dimension)
+    
+    def __neg__(self):
+        return MeasureArray.fromBase(-self.value, self.dimension)
+    
+    def __abs__(self):
+        return MeasureArray.fromBase(np.abs(self.value), self.dimension)
+    
+    def __add__(self, other):
+        if not isinstance(other, Measure):
+            return NotImplemented
+        return MeasureArray.fromBase(self.value + other.value, self.dimension + other.dimension)
+    
+    def __radd__(self, other):
+        if not isinstance(other, Measure):
+            return NotImplemented
+        return MeasureArray.fromBase(other.value + self.value, other.dimension + self.dimension)
+    
+    def __iadd__(self, other):
+        if not isinstance(other, Measure):
+            return NotImplemented
+        self.dimension + other.dimension # check the dimensions before touching the values
+        self.value += other.value
+        return self
+    
+    def __sub__(self, other):
+        if not isinstance(other, Measure):
+            return NotImplemented
+        return MeasureArray.fromBase(self.value - other.value, self.dimension - other.dimension)
+    
+    def __rsub__(self, other):
+        if not isinstance(other, Measure):
+            return NotImplemented
+        return MeasureArray.fromBase(other.value - self.value, other.dimension - self.dimension)
+    
+    def __isub__(self, other):
+        if not isinstance(other, Measure):
+            return NotImplemented
+        self.dimension - other.dimension # check the dimensions before touching the values
+        self.value -= other.value
+        return self
+    
+    def __mul__(self, other):
+        if isinstance(other, Measure):
+            return MeasureArray.fromBase(self.value * other.value, self.dimension * other.dimension)
+        elif isinstance(other, scalars):
+            return MeasureArray.fromBase(self.value * other, self.dimension)
+        else:
+            return NotImplemented
+    
+    def __rmul__(self, other):
+        if isinstance(other, Measure):
+            return MeasureArray.fromBase(other.value * self.value, other.dimension * self.dimension)
+        elif isinstance(other, scalars):
+            return MeasureArray.fromBase(other * self.value, self.dimension)
+        else:
+            return NotImplemented
+    
+    def __imul__(self, other):
+        if isinstance(other, Measure):
+            self.value *= other.value
+            self.dimension = self.dimension * other.dimension
+        elif isinstance(other, scalars):
+            self.value *= other
+        else:
+            return NotImplemented
+        return self
+    
+    def __truediv__(self, other):
+        if isinstance(other, Measure):
+            return MeasureArray.fromBase(self.value / other.value, self.dimension / other.dimension)
+        elif isinstance(other, scalars):
+            return MeasureArray.fromBase(self.value / other, self.dimension)
+        else:
+            return NotImplemented
+    
+    def __rtruediv__(self, other):
+        if isinstance(other, Measure):
+            return MeasureArray.fromBase(other.value / self.value, other.dimension / self.dimension)
+        elif isinstance(other, scalars):
+            return MeasureArray.fromBase(other / self.value, self.dimension ** -1)
+        else:
+            return NotImplemented
+    
+    def __itruediv__(self, other):
+        if isinstance(other, Measure):
+            self.value /= other.value
+            self.dimension = self.dimension / other.dimension
+        elif isinstance(other, scalars):
+            self.value /= other
+        else:
+            return NotImplemented
+        return self
+    
+    def __pow__(self, power):
+        return MeasureArray.fromBase(self.value ** power, self.dimension ** power)
+    
+    def __ipow__(self, power):
+        self.value **= power
+        self.dimension = self.dimension ** power
+        return self
+    
+    def __round__(self, digits=0):
+        return MeasureArray.fromBase(np.round(self.value, digits), self.dimension)
+    
+    def __trunc__(self):
+        return MeasureArray.fromBase(np.trunc(self.value), self.dimension)
+    
+    def __ceil__(self):
+        return MeasureArray.fromBase(np.ceil(self.value), self.dimension)
+    
+    def __len__(self):
+        return len(self.value)
+    
+    def __iter__(self):
+        dimension = self.dimension
+        return (Measure.fromBase(v, dimension) for v in self.value.tolist())
+    
+    def __getitem__(self, key):
+        """
+        with a unit string, returns the values in that unit (ex: arr["lbf"])
+        otherwise indexes the values: an index gives a Measure and a slice or
+        mask gives a MeasureArray (slices are views, not copies)
+        """
+        if isinstance(key, str):
+            (m, d) = readUnit(key)
+            if d == self.dimension:
+                return self.value/m # get values from base units
+            else:
+                raise ValueError("the measure is not in the dimension of that unit")
+        values = self.value[key]
+        if np.ndim(values) == 0:
+            return Measure.fromBase(values.item(), self.dimension)
+        return MeasureArray.fromBase(values, self.dimension)
+    
+    @property
+    def dtype(self):
+        return self.value.dtype
+    
+    @property
+    def shape(self):
+        return self.value.shape
@@ -0,0 +1,182 @@
+"""
+a table of measures stored by column
+
+    frame = MeasureFrame({"time": MeasureArray(t, "s"), "flow": MeasureArray(q, "L/min")})
+    frame["volume"] = frame["flow"] * frame["time"]
+    busy = frame.where(frame.between("flow", "2 L/min", "10 L/min"))
+    busy.project({"volume": "L"}) # {"volume": (numbers in L, "L")}
+
+the values of all columns are copied into one contiguous buffer (a row per
+column, in base units) when a frame is made, and each column keeps a single
+Dimension; columns and row slices are numpy views into that buffer
+"""
+from Measure import Measure, readUnit
+from MeasureArray import MeasureArray
+import numpy as np
+
+class MeasureFrame:
+    """
+    columns of values, each with its own dimension, all of the same length
+    """
+    def __init__(self, columns, dtype=np.float64):
+        """
+        columns :: {String: MeasureArray} -- the columns by name, in order
+        dtype :: numpy.dtype -- of the buffer holding the values
+        """
+        columns = dict(columns)
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("the columns have different lengths: {}".format(sorted(lengths)))
+        buffer = np.empty((len(columns), lengths.pop() if lengths else 0), dtype=dtype)
+        for (row, column) in zip(buffer, columns.values()):
+            row[:] = column.value
+        self.names = list(columns)
+        self.values = list(buffer) # views of the rows of the buffer
+        self.dimensions = [column.dimension for column in columns.values()]
+        self.length = buffer.shape[1]
+    
+    @classmethod
+    def fromRows(cls, rows, units, dtype=np.float64):
+        """
+        fromRows :: Iterable (Number...) -> {String: String} -> MeasureFrame
+        takes rows of plain numbers and the name and unit of each column, in order
+        """
+        buffer = np.array(list(rows), dtype=dtype).reshape(-1, len(units)).T
+        return cls({name: MeasureArray(values, unit, dtype) for ((name, unit), values) in zip(units.items(), buffer)}, dtype)
+    
+    @classmethod
+    def fromBase(cls, names, values, dimensions):
+        """
+        fromBase :: [String] -> [numpy.ndarray] -> [Dimension] -> MeasureFrame
+        takes column values already in base units, without copying them
+        """
+        frame = object.__new__(cls)
+        frame.names = list(names)
+        frame.values = list(values)
+        frame.dimensions = list(dimensions)
+        frame.length = len(frame.values[0]) if frame.values else 0
+        return frame
+    
+    def __len__(self):
+        return self.length
+    
+    def __contains__(self, name):
+        return name in self.names
+    
+    def __iter__(self):
+        return iter(self.names)
+    
+    @property
+    def shape(self):
+        return (self.length, len(self.names))
+    
+    def column(self, name):
+        """
+        column :: String -> Int
+        returns the position of the column
+        """
+        try:
+            return self.names.index(name)
+        except ValueError:
+            raise KeyError("no column \"{}\"".format(name)) from None
+    
+    def __getitem__(self, key):
+        """
+        with a column name, returns the column as a MeasureArray (a view)
+        with a list of names, returns a frame of those columns (sharing their values)
+        otherwise selects rows like numpy: a slice gives a frame of views, a
+        mask or a list of row numbers gives a frame of copies
+        """
+        if isinstance(key, str):
+            i = self.column(key)
+            return MeasureArray.fromBase(self.values[i], self.dimensions[i])
+        if isinstance(key, list) and all(isinstance(k, str) for k in key):
+            return self.select(*key)
+        if isinstance(key, int):
+            raise TypeError("select rows with a slice, a mask or a list of row numbers")
+        return MeasureFrame.fromBase(self.names, [values[key] for values in self.values], self.dimensions)
+    
+    def __setitem__(self, name, column):
+        """
+        adds or replaces a column
+        """
+        if len(column) != self.length and self.names:
+            raise ValueError("a column of {} values cannot be added to a frame of {} rows".format(len(column), self.length))
+        if name in self.names:
+            i = self.column(name)
+            (self.values[i], self.dimensions[i]) = (column.value, column.dimension)
+        else:
+            self.names.append(name)
+            self.values.append(column.value)
+            self.dimensions.append(column.dimension)
+            self.length = len(column)
+    
+    def __delitem__(self, name):
+        i = self.column(name)
+        del self.names[i], self.values[i], self.dimensions[i]
+    
+    def select(self, *names):
+        """
+        select :: String... -> MeasureFrame
+        returns a frame of the named columns, sharing their values
+        """
+        positions = [self.column(name) for name in names]
+        return MeasureFrame.fromBase(names, [self.values[i] for i in positions], [self.dimensions[i] for i in positions])
+    
+    def between(self, name, low=None, high=None, unit=None):
+        """
+        between :: String -> Measure|String|Number -> Measure|String|Number -> String -> numpy.ndarray
+        returns the mask of the rows where the column is at least low and below high
+        bounds can be measures in any unit of the column, strings like "3 ft"
+        or numbers in unit (either bound can be None)
+        """
+        from Aggregate import boundValues # the bound rules are shared with Aggregate
+        i = self.column(name)
+        (values, dimension) = (self.values[i], self.dimensions[i])
+        mask = np.ones(self.length, dtype=bool)
+        if low is not None:
+            mask &= values >= boundValues(low, dimension, unit)
+        if high is not None:
+            mask &= values < boundValues(high, dimension, unit)
+        return mask
+    
+    def where(self, mask):
+        """
+        where :: numpy.ndarray -> MeasureFrame
+        returns the rows where the mask is true
+        """
+        return self[np.asarray(mask, dtype=bool)]
+    
+    def project(self, units=None, system="SI"):
+        """
+        project :: {String: String} -> String -> {String: (numpy.ndarray, String)}
+        returns the values of every column (or just the columns in units) as
+        numbers in a display unit, with that unit
+        columns without a unit (or a unit of None) are shown in the best unit of the system
+        raises ValueError if a unit is not in the dimension of its column
+        """
+        from Display import simplify # only pay for it when it is used
+        names = self.names if units is None else list(units)
+        projected = {}
+        for name in names:
+            i = self.column(name)
+            unit = None if units is None else units[name]
+            if unit is None:
+                projected[name] = simplify(MeasureArray.fromBase(self.values[i], self.dimensions[i]), system)
+            else:
+                (m, d) = readUnit(unit)
+                if d is not self.dimensions[i]:
+                    raise ValueError("column \"{}\" [{}] cannot be shown in \"{}\" [{}]".format(name, self.dimensions[i], unit, d))
+                projected[name] = (self.values[i] / m, unit)
+        return projected
+    
+    def row(self, index):
+        """
+        row :: Int -> {String: Measure}
+        """
+        return {name: Measure.fromBase(values[index].item(), dimension) for (name, values, dimension) in zip(self.names, self.values, self.dimensions)}
+    
+    def __str__(self):
+        return "MeasureFrame({} rows: {})".format(self.length, ", ".join("{} [{}]".format(name, dimension) for (name, dimension) in zip(self.names, self.dimensions)))
+    
+    __repr__ = __str__
@@ -0,0 +1,104 @@
+"""
+normalize large batches of (value, unit string) pairs on several processes
+
+each worker process parses the common units once when it starts, then
+converts whole chunks of pairs and ships back one packed buffer of base-unit
+values per chunk instead of pickling every Measure
+"""
+from Measure import Measure, readUnit
+from Unit import Dimension, chunks
+from array import array
+from collections import deque
+from functools import partial
+import multiprocessing
+import os
+
+def warmUnits(unitStrings):
+    """
+    parses the given unit strings so that they are in the unit cache
+    used as the initializer of each worker process
+    """
+    for unit in unitStrings:
+        try:
+            readUnit(unit)
+        except (ValueError, KeyError, AttributeError, TypeError): # it will be reported when it is used
+            pass
+
+def boundedMap(pool, function, tasks, inFlight):
+    """
+    boundedMap :: multiprocessing.Pool -> (a -> b) -> Iterable a -> Int -> Iterator b
+    like pool.imap, but reads at most inFlight tasks ahead of the results
+    taken, so a huge input is never buffered in the parent
+    """
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= inFlight:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(function, (task,)))
+    while pending:
+        yield pending.popleft().get()
+
+def readChunk(pairs):
+    """
+    readChunk :: [(Number, String)] -> (Bytes, Bytes, [(Number...)])
+    converts the pairs to base units
+    returns the packed values, the packed index of each value's dimension and
+    the exponents of those dimensions
+    """
+    values = array("d")
+    kinds = array("H")
+    dimensions = {} # {Dimension: index}
+    for (value, unit) in pairs:
+        (m, d) = readUnit(unit)
+        values.append(value*m)
+        kind = dimensions.get(d)
+        if kind is None:
+            kind = dimensions[d] = len(dimensions)
+        kinds.append(kind)
+    return (values.tobytes(), kinds.tobytes(), [d.exponents for d in dimensions])
+
+def convertChunk(unit, pairs):
+    """
+    convertChunk :: String -> [(Number, String)] -> Bytes
+    converts the pairs to the given unit
+    returns the packed values
+    raises ValueError if a pair is not in the dimension of the unit
+    """
+    (tm, td) = readUnit(unit)
+    values = array("d")
+    for (value, fromUnit) in pairs:
+        (m, d) = readUnit(fromUnit)
+        if d is not td:
+            raise ValueError("\"{}\" [{}] cannot be converted to \"{}\" [{}]".format(fromUnit, d, unit, td))
+        values.append(value*m/tm)
+    return values.tobytes()
+
+def parallelMeasures(pairs, processes=None, chunkSize=65536, warm=()):
+    """
+    parallelMeasures :: Iterable (Number, String) -> Iterator Measure
+    takes (value, unit string) pairs and yields them as measures, in order
+    the pairs are converted chunkSize at a time on a pool of processes whose
+    unit caches are warmed with the unit strings in warm, reading at most two
+    chunks per process ahead of the measures yielded
+    """
+    processes = processes or os.cpu_count() or 1
+    with multiprocessing.Pool(processes, initializer=warmUnits, initargs=(list(warm),)) as pool:
+        for (values, kinds, exponents) in boundedMap(pool, readChunk, chunks(pairs, chunkSize), 2*processes):
+            dimensions = [Dimension.fromExponents(e) for e in exponents]
+            fromBase = Measure.fromBase
+            for (value, kind) in zip(array("d", values), array("H", kinds)):
+                yield fromBase(value, dimensions[kind])
+
+def parallelConvert(pairs, unit, processes=None, chunkSize=65536, warm=()):
+    """
+    parallelConvert :: Iterable (Number, String) -> String -> array.array
+    takes (value, unit string) pairs and a target unit
+    returns all the values converted to that unit, in order, as one packed array
+    raises ValueError if any pair is not in the dimension of the unit
+    """
+    processes = processes or os.cpu_count() or 1
+    result = array("d")
+    with multiprocessing.Pool(processes, initializer=warmUnits, initargs=(list(warm) + [unit],)) as pool:
+        for values in boundedMap(pool, partial(convertChunk, unit), chunks(pairs, chunkSize), 2*processes):
+            result.frombytes(values)
+    return result
@@ -0,0 +1,147 @@
+from Measure import readUnit
+from MeasureArray import MeasureArray
+import csv
+import mmap
+import os
+import numpy as np
+
+class Chunk:
+    """
+    a block of rows read from a stream of "value unit" cells
+    each column is one MeasureArray (one dimension and one value buffer)
+    rows that could not be read are left out and reported in errors
+    """
+    __slots__ = ("names", "columns", "lineNumbers", "errors")
+    
+    def __init__(self, names, columns, lineNumbers, errors):
+        """
+        names :: [String] | None -- the header, if the stream had one
+        columns :: [MeasureArray]
+        lineNumbers :: numpy.ndarray -- the source line of each row
+        errors :: [(Int, String)] -- the line and reason of each skipped row
+        """
+        self.names = names
+        self.columns = columns
+        self.lineNumbers = lineNumbers
+        self.errors = errors
+    
+    def __len__(self):
+        return len(self.lineNumbers)
+    
+    def __getitem__(self, key):
+        """
+        returns a column by its index or, if the stream had a header, its name
+        """
+        if isinstance(key, str):
+            key = self.names.index(key)
+        return self.columns[key]
+
+def readMeasures(source, chunkSize=65536, delimiter=",", header=False, memoryMap=False):
+    """
+    readMeasures :: (String|PathLike|Iterable String) -> Iterator Chunk
+    takes a path or an iterable of lines of delimited "value unit" cells
+    (ex: "12.5 km,3 ft") and yields them chunkSize rows at a time
+    each distinct unit string in a chunk is parsed once and its values are
+    converted to base units in bulk
+    malformed rows are reported in Chunk.errors instead of stopping the stream
+    memoryMap reads a path through mmap, which keeps multi-GB files out of the heap
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if memoryMap:
+            yield from readMemoryMappedMeasures(source, chunkSize, delimiter, header)
+        else:
+            with open(source, newline="", encoding="utf-8") as file:
+                yield from readMeasureLines(file, chunkSize, delimiter, header)
+    else:
+        yield from readMeasureLines(source, chunkSize, delimiter, header)
+
+def readMemoryMappedMeasures(path, chunkSize, delimiter, header):
+    """
+    readMemoryMappedMeasures :: (String|PathLike) -> Int -> String -> Bool -> Iterator Chunk
+    reads the lines of the file through a read-only memory map
+    """
+    if os.path.getsize(path) == 0: # mmap cannot map an empty file
+        return
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        lines = (line.decode("utf-8") for line in iter(mapped.readline, b""))
+        yield from readMeasureLines(lines, chunkSize, delimiter, header)
+
+def readMeasureLines(lines, chunkSize, delimiter, header):
+    """
+    readMeasureLines :: Iterable String -> Int -> String -> Bool -> Iterator Chunk
+    groups the rows into chunks; the first row fixes the number of columns and
+    the first readable cell of each column fixes its dimension
+    """
+    rows = csv.reader(lines, delimiter=delimiter, skipinitialspace=True)
+    names = next(rows, None) if header else None
+    layout = {"width": len(names) if names else None, "dimensions": None}
+    pending = [] # [(lineNumber, [String])]
+    for cells in rows:
+        if not cells: # skip blank lines
+            continue
+        pending.append((rows.line_num, cells))
+        if len(pending) == chunkSize:
+            yield readChunk(pending, names, layout)
+            pending = []
+    if pending:
+        yield readChunk(pending, names, layout)
+
+def readChunk(pending, names, layout):
+    """
+    readChunk :: [(Int, [String])] -> [String] -> {String: a} -> Chunk
+    converts the pending rows to a chunk, updating the layout shared between chunks
+    """
+    if layout["width"] is None:
+        layout["width"] = len(pending[0][1])
+    width = layout["width"]
+    if layout["dimensions"] is None:
+        layout["dimensions"] = [None] * width
+    dimensions = layout["dimensions"]
+    errors = {} # {rowIndex: (lineNumber, message)}
+    # group the cells of each column by their unit string
+    groups = [{} for _ in range(width)] # [{unit: ([rowIndex], [valueString])}]
+    for (row, (line, cells)) in enumerate(pending):
+        if len(cells) != width:
+            errors[row] = (line, "expected {} cells, found {}".format(width, len(cells)))
+            continue
+        for (column, cell) in enumerate(cells):
+            parts = cell.split(None, 1)
+            if len(parts) != 2:
+                errors[row] = (line, "cell {} is not a \"value unit\" pair: \"{}\"".format(column, cell))
+                break
+            (rowsOfUnit, valuesOfUnit) = groups[column].setdefault(parts[1].strip(), ([], []))
+            rowsOfUnit.append(row)
+            valuesOfUnit.append(parts[0])
+    # convert each group to base units at once
+    values = np.empty((width, len(pending)))
+    for (column, group) in enumerate(groups):
+        for (unit, (rowsOfUnit, valuesOfUnit)) in group.items():
+            try:
+                (m, d) = readUnit(unit)
+            except (ValueError, KeyError, AttributeError, TypeError):
+                for row in rowsOfUnit:
+                    errors.setdefault(row, (pending[row][0], "unknown unit \"{}\"".format(unit)))
+                continue
+            if dimensions[column] is None:
+                dimensions[column] = d
+            elif dimensions[column] != d:
+                for row in rowsOfUnit:
+                    errors.setdefault(row, (pending[row][0], "unit \"{}\" [{}] does not match column {} [{}]".format(unit, d, column, dimensions[column])))
+                continue
+            try:
+                numbers = np.array(valuesOfUnit, dtype=np.float64)
+            except ValueError: # find the offending cells one at a time
+                numbers = np.empty(len(valuesOfUnit))
+                for (i, (row, text)) in enumerate(zip(rowsOfUnit, valuesOfUnit)):
+                    try:
+                        numbers[i] = float(text)
+                    except ValueError:
+                        numbers[i] = np.nan
+                        errors.setdefault(row, (pending[row][0], "cannot read the number \"{}\"".format(text)))
+            values[column, rowsOfUnit] = numbers * m
+    # keep only the rows that were read completely
+    keep = np.ones(len(pending), dtype=bool)
+    keep[list(errors)] = False
+    lineNumbers = np.fromiter((line for (line, _) in pending), dtype=np.int64, count=len(pending))[keep]
+    columns = [MeasureArray.fromBase(values[column, keep], dimensions[column]) for column in range(width)]
+    return Chunk(names, columns, lineNumbers, sorted(errors.values()))
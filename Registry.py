@@ -0,0 +1,141 @@
+"""
+unit registries that can be changed while other threads read units
+
+    registry = UnitRegistry()
+    registry.define("kip", 1000, "lbf")
+    registry.readUnit("kip/in^2")
+    registry.measure(3, "kip")
+
+a registry publishes immutable snapshots: readers take the current snapshot
+with one attribute read and never lock, while writers copy the table, compile
+the copy and swap it in under a lock that only writers take
+each snapshot has its own version number and parse cache, so caches derived
+from a registry are invalidated by comparing versions, and any number of
+registries can coexist with each other and with the global units table
+"""
+import Measure as measureModule
+from Measure import Measure, UnitCache, parseUnit, resolveUnit, compileUnits, unitName
+from Unit import Dimension
+from itertools import count
+from numbers import Number
+from threading import Lock
+from types import MappingProxyType
+
+versions = count(1) # shared by all registries, so a version names one snapshot
+
+class RegistrySnapshot:
+    """
+    one published version of a registry's units, never changed afterwards
+    (except for remembering prefixed units and parsed unit strings)
+    """
+    __slots__ = ("version", "table", "compiled", "cache")
+    
+    def __init__(self, table, cacheSize=256):
+        """
+        table :: {String: (Number, Dimension|String)} -- owned by the snapshot from now on
+        """
+        self.compiled = compileUnits(table) # raises ValueError on a broken table
+        self.table = MappingProxyType(table)
+        self.cache = UnitCache(cacheSize, self.parse)
+        self.version = next(versions)
+    
+    def resolve(self, unit):
+        return resolveUnit(self.compiled, unit)
+    
+    def parse(self, unitString):
+        return parseUnit(unitString, self.resolve)
+    
+    def readUnit(self, unitString):
+        """
+        readUnit :: String -> (Number, Dimension)
+        """
+        return self.cache.lookup(unitString)
+
+class UnitRegistry:
+    """
+    a units table with lock-free reads and copy-on-write updates
+    """
+    def __init__(self, table=None, cacheSize=256):
+        """
+        table :: {String: (Number, Dimension|String)} -- copied, the global units table by default
+        cacheSize :: Int -- the most unit strings each snapshot remembers
+        """
+        self.cacheSize = cacheSize
+        self.lock = Lock() # only taken by writers
+        self.snapshot = RegistrySnapshot(dict(measureModule.units if table is None else table), cacheSize)
+    
+    @property
+    def version(self):
+        return self.snapshot.version
+    
+    @property
+    def table(self):
+        """
+        the current units table (read only)
+        """
+        return self.snapshot.table
+    
+    def readUnit(self, unitString):
+        """
+        readUnit :: String -> (Number, Dimension)
+        returns the multiplier to base units and the dimension of the unit
+        """
+        return self.snapshot.cache.lookup(unitString)
+    
+    def measure(self, value, unit):
+        """
+        measure :: Number -> String -> Measure
+        returns the value in the unit as a Measure
+        """
+        (m, d) = self.snapshot.cache.lookup(unit)
+        return Measure.fromBase(value*m, d)
+    
+    def define(self, name, multiplier, unit):
+        """
+        define :: String -> Number -> Dimension|String -> Int
+        adds or replaces the unit name, worth multiplier of unit (ex: define("kip", 1000, "lbf"))
+        returns the version of the new snapshot
+        """
+        return self.update({name: (multiplier, unit)})
+    
+    def update(self, entries=(), remove=()):
+        """
+        update :: {String: (Number, Dimension|String)} -> [String] -> Int
+        adds or replaces entries and removes names, publishing them together
+        returns the version of the new snapshot
+        raises ValueError (leaving the registry as it was) if a name cannot be
+        read back in unit strings or the table would not compile
+        """
+        entries = dict(entries)
+        for (name, (multiplier, unit)) in entries.items():
+            if unitName.fullmatch(name) is None:
+                raise ValueError("\"{}\" cannot be used as a unit name".format(name))
+            if not isinstance(multiplier, Number):
+                raise ValueError("the multiplier of unit \"{}\" must be a number".format(name))
+            if not isinstance(unit, (str, Dimension)):
+                raise ValueError("unit \"{}\" must be defined by a unit string or a Dimension".format(name))
+        with self.lock:
+            table = dict(self.snapshot.table)
+            for name in remove:
+                if name not in table:
+                    raise KeyError(name)
+                del table[name]
+            table.update(entries)
+            self.snapshot = RegistrySnapshot(table, self.cacheSize)
+            return self.snapshot.version
+    
+    def undefine(self, *names):
+        """
+        undefine :: String... -> Int
+        removes the units, returns the version of the new snapshot
+        raises ValueError if other units still reference them
+        """
+        return self.update(remove=names)
+    
+    def __contains__(self, name):
+        return name in self.snapshot.table
+    
+    def __str__(self):
+        return "UnitRegistry(version {}, {} units)".format(self.snapshot.version, len(self.snapshot.table))
+    
+    __repr__ = __str__
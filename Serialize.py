@@ -0,0 +1,190 @@
+"""
+a compact binary format for measures
+
+    header: magic "PYUM", version (uint16), reserved (uint16)
+    blocks: value count (uint64), the 8 dimension exponents (float64),
+            then that many values in base units (float64)
+
+all numbers are little-endian; every block header is 72 bytes, so values
+stay 8-byte aligned and can be read in place through memoryview or numpy
+"""
+from Measure import Measure
+from Unit import Dimension
+from array import array
+import struct
+import sys
+
+MAGIC = b"PYUM"
+VERSION = 1
+headerFormat = struct.Struct("<4sHH")
+blockFormat = struct.Struct("<Q8d")
+littleEndian = sys.byteorder == "little"
+
+class MeasureWriter:
+    """
+    streams measures to a binary file
+    consecutive measures with the same dimension are packed into one block
+    """
+    def __init__(self, file, blockSize=65536):
+        """
+        file :: a binary file opened for writing
+        blockSize :: Int -- the most single measures buffered into one block
+        """
+        self.file = file
+        self.blockSize = blockSize
+        self.dimension = None # the dimension of the buffered measures
+        self.pending = array("d")
+        file.write(headerFormat.pack(MAGIC, VERSION, 0))
+    
+    def write(self, measure):
+        """
+        writes a Measure, or a MeasureArray as a block of its own
+        """
+        if isinstance(measure.value, (int, float)):
+            if measure.dimension is not self.dimension or len(self.pending) >= self.blockSize:
+                self.flush()
+                self.dimension = measure.dimension
+            self.pending.append(measure.value)
+        else:
+            self.writeValues(measure.dimension, measure.value)
+    
+    def writeMany(self, measures):
+        for measure in measures:
+            self.write(measure)
+    
+    def writeValues(self, dimension, values):
+        """
+        writes a block of values already in base units
+        values can be anything with float64 items in the buffer protocol (ex:
+        array.array("d") or a numpy array), or any iterable of numbers
+        """
+        self.flush()
+        self.writeBlock(dimension, values)
+    
+    def writeBlock(self, dimension, values):
+        try:
+            view = memoryview(values)
+        except TypeError:
+            view = memoryview(array("d", values))
+        if view.format != "d":
+            view = memoryview(array("d", view.tolist() if view.ndim else [view.tolist()]))
+        if not view.c_contiguous:
+            view = memoryview(view.tobytes()).cast("d")
+        count = view.nbytes // 8
+        self.file.write(blockFormat.pack(count, *dimension.exponents))
+        if littleEndian:
+            self.file.write(view.cast("B"))
+        else:
+            swapped = array("d", view.cast("B").cast("d"))
+            swapped.byteswap()
+            self.file.write(swapped)
+    
+    def flush(self):
+        """
+        writes the buffered measures as a block
+        """
+        if self.pending:
+            self.writeBlock(self.dimension, self.pending)
+            self.pending = array("d")
+        self.dimension = None
+    
+    def close(self):
+        self.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exception):
+        self.close()
+
+def readHeader(header):
+    if len(header) != headerFormat.size:
+        raise ValueError("truncated measure file")
+    (magic, version, _) = headerFormat.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("not a measure file")
+    if version != VERSION:
+        raise ValueError("unsupported measure file version {}".format(version))
+
+def iterBlocks(source):
+    """
+    iterBlocks :: Bytes|Buffer|File -> Iterator (Dimension, memoryview)
+    yields the dimension and the values (a memoryview of doubles) of each block
+    from a buffer (bytes, bytearray, mmap, ...) the values are views into it,
+    not copies; from a file object each block is read into a new buffer
+    """
+    if hasattr(source, "read"):
+        yield from iterFileBlocks(source)
+        return
+    data = memoryview(source).cast("B")
+    readHeader(data[:headerFormat.size])
+    offset = headerFormat.size
+    while offset < len(data):
+        if offset + blockFormat.size > len(data):
+            raise ValueError("truncated measure file")
+        (count, *exponents) = blockFormat.unpack_from(data, offset)
+        offset += blockFormat.size
+        values = data[offset:offset + 8*count]
+        if len(values) != 8*count:
+            raise ValueError("truncated measure file")
+        offset += 8*count
+        yield (Dimension.fromExponents(exponents), fromLittleEndian(values))
+
+def iterFileBlocks(file):
+    readHeader(readExactly(file, headerFormat.size))
+    while True:
+        header = file.read(blockFormat.size)
+        if not header:
+            return
+        if len(header) != blockFormat.size:
+            raise ValueError("truncated measure file")
+        (count, *exponents) = blockFormat.unpack(header)
+        yield (Dimension.fromExponents(exponents), fromLittleEndian(memoryview(readExactly(file, 8*count))))
+
+def readExactly(file, size):
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("truncated measure file")
+    return data
+
+def fromLittleEndian(view):
+    """
+    fromLittleEndian :: memoryview -> memoryview
+    returns the bytes as a view of doubles, copying only on big-endian machines
+    """
+    if littleEndian:
+        return view.cast("d")
+    values = array("d", view.tobytes())
+    values.byteswap()
+    return memoryview(values)
+
+def loadMeasures(source):
+    """
+    loadMeasures :: Bytes|Buffer|File -> Iterator Measure
+    yields every measure stored in the source
+    """
+    fromBase = Measure.fromBase
+    for (dimension, values) in iterBlocks(source):
+        for value in values.tolist():
+            yield fromBase(value, dimension)
+
+def loadArrays(source):
+    """
+    loadArrays :: Bytes|Buffer|File -> Iterator MeasureArray
+    yields each block as a MeasureArray sharing the memory of the source
+    """
+    import numpy as np # only needed here
+    from MeasureArray import MeasureArray
+    for (dimension, values) in iterBlocks(source):
+        yield MeasureArray.fromBase(np.frombuffer(values, dtype="<f8"), dimension)
+
+def dumpMeasures(measures):
+    """
+    dumpMeasures :: Iterable Measure -> Bytes
+    returns the measures in the binary format
+    """
+    from io import BytesIO
+    buffer = BytesIO()
+    with MeasureWriter(buffer) as writer:
+        writer.writeMany(measures)
+    return buffer.getvalue()
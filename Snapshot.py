@@ -0,0 +1,144 @@
+from Unit import Dimension
+from bisect import bisect_left
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+# the file is a header followed by fixed-width records sorted by unit name
+#   header: magic, version, fingerprint of the source table, record count
+#   record: unit name (utf-8, zero padded), multiplier kind ("i" or "f"),
+#           multiplier (int64 or float64), the 8 exponents
+# all numbers are little-endian
+MAGIC = b"PYUS"
+VERSION = 1
+headerFormat = struct.Struct("<4sH16sI")
+nameSize = 24
+recordFormat = struct.Struct("<{}sc8s8d".format(nameSize))
+fingerprintFormat = struct.Struct("<IIQ") # fills the 16 bytes of the header
+
+# seconds allowed for "import Measure" in a fresh interpreter, see importTime
+IMPORT_TIME_BUDGET = 0.05
+
+class SnapshotUnits(dict):
+    """
+    a compiled units table backed by a memory-mapped snapshot
+    entries are decoded from the mapping the first time they are looked up,
+    so processes sharing the file also share its pages
+    """
+    def __init__(self, mapped, count):
+        """
+        mapped :: mmap.mmap -- the whole snapshot file
+        count :: Int -- the number of records in it
+        """
+        super().__init__()
+        self.mapped = mapped
+        self.names = SnapshotNames(mapped, count)
+    
+    def __missing__(self, unit):
+        encoded = unit.encode("utf-8")
+        index = bisect_left(self.names, encoded)
+        if index == len(self.names) or self.names[index] != encoded:
+            raise KeyError(unit)
+        (_, kind, m, *exponents) = recordFormat.unpack_from(self.mapped, headerFormat.size + index*recordFormat.size)
+        (m,) = struct.unpack("<q" if kind == b"i" else "<d", m)
+        result = self[unit] = (m, Dimension.fromExponents(exponents))
+        return result
+
+class SnapshotNames:
+    """
+    the sorted unit names of a snapshot, read straight from the mapping
+    """
+    def __init__(self, mapped, count):
+        self.mapped = mapped
+        self.count = count
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, index):
+        offset = headerFormat.size + index*recordFormat.size
+        return self.mapped[offset:offset + nameSize].rstrip(b"\0")
+
+def tableFingerprint(table):
+    """
+    tableFingerprint :: {String: (Number, Dimension|String)} -> Bytes
+    returns a digest that changes whenever the source units table changes
+    (two checksums and the length of the table's text, which is cheaper to
+    import than hashlib and enough to notice an edited table)
+    """
+    text = repr([(unit, m, d if isinstance(d, str) else d.exponents) for (unit, (m, d)) in table.items()]).encode("utf-8")
+    return fingerprintFormat.pack(zlib.crc32(text), zlib.adler32(text), len(text))
+
+def writeSnapshot(path, compiled, fingerprint):
+    """
+    writes the compiled units table to path, replacing it atomically
+    """
+    records = sorted((unit.encode("utf-8"), m, d) for (unit, (m, d)) in compiled.items())
+    for (name, m, _) in records:
+        if len(name) > nameSize:
+            raise ValueError("unit name too long for a snapshot: \"{}\"".format(name.decode("utf-8")))
+        if isinstance(m, int) and not -2**63 <= m < 2**63:
+            raise ValueError("multiplier of \"{}\" too large for a snapshot".format(name.decode("utf-8")))
+    temporary = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        with open(temporary, "wb") as file:
+            file.write(headerFormat.pack(MAGIC, VERSION, fingerprint, len(records)))
+            for (name, m, d) in records:
+                kind = b"i" if isinstance(m, int) else b"f"
+                file.write(recordFormat.pack(name, kind, struct.pack("<q" if kind == b"i" else "<d", m), *d.exponents))
+        os.replace(temporary, path)
+    except BaseException: # never leave a partial file behind
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+def openSnapshot(path, fingerprint):
+    """
+    openSnapshot :: String -> Bytes -> SnapshotUnits | None
+    returns the snapshot at path if it exists and was made from the same table
+    """
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError): # missing or empty
+        return None
+    if len(mapped) < headerFormat.size:
+        return None
+    (magic, version, storedFingerprint, count) = headerFormat.unpack_from(mapped)
+    if magic != MAGIC or version != VERSION or storedFingerprint != fingerprint or len(mapped) != headerFormat.size + count*recordFormat.size:
+        return None
+    return SnapshotUnits(mapped, count)
+
+def loadCompiledUnits(table, compile, path):
+    """
+    loadCompiledUnits :: {String: (Number, Dimension|String)} -> Function -> String -> {String: (Number, Dimension)}
+    returns the compiled units table from the snapshot at path, compiling the
+    table and (re)writing the snapshot when it is missing or out of date
+    """
+    fingerprint = tableFingerprint(table)
+    snapshot = openSnapshot(path, fingerprint)
+    if snapshot is not None:
+        return snapshot
+    compiled = compile(table)
+    try:
+        writeSnapshot(path, compiled, fingerprint)
+    except (OSError, ValueError, struct.error): # the snapshot is only an optimization (ex: a name too long for it)
+        pass
+    return compiled
+
+def importTime(repeat=5):
+    """
+    importTime :: Int -> Number
+    returns the best time in seconds, over repeat fresh interpreters, to import Measure
+    """
+    import subprocess
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = "import time; t = time.perf_counter(); import Measure; print(time.perf_counter() - t)"
+    return min(float(subprocess.run([sys.executable, "-c", code], cwd=here, check=True, capture_output=True, text=True).stdout) for _ in range(repeat))
+
+if __name__ == "__main__":
+    seconds = importTime()
+    print("import Measure: {:.2f} ms (budget {:.2f} ms)".format(seconds*1000, IMPORT_TIME_BUDGET*1000))
+    sys.exit(0 if seconds <= IMPORT_TIME_BUDGET else 1)
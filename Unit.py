@@ -1,46 +1,131 @@
-# TODO: figure out how to pass by value
+from threading import Lock
+from weakref import WeakValueDictionary
+from itertools import islice
+
 class Dimension:
+    """
+    an immutable vector of the powers of each base dimension
+    instances are interned, so equal dimensions are the same object and
+    equality is an identity check
+    """
+    __slots__ = ("exponents", "strings", "__weakref__")
+    
+    names = ("length", "mass", "time", "current", "temperature", "amountOfSubstance", "luminousIntensity", "angle")
     baseUnits = {"length": "m", "mass": "kg", "time": "s", "current": "A", "temperature": "K", "amountOfSubstance": "mol", "luminousIntensity": "cd", "angle": "rad"}
     
-    def __init__(self, length=0, mass=0, time=0, current=0, temperature=0, amountOfSubstance=0, luminousIntensity=0, angle=0):
-        self.length = length
-        self.mass = mass
-        self.time = time
-        self.current = current
-        self.temperature = temperature
-        self.amountOfSubstance = amountOfSubstance
-        self.luminousIntensity = luminousIntensity
-        self.angle = angle
+    instances = WeakValueDictionary() # {exponents: Dimension}
+    instancesLock = Lock()
+    # memoized algebra, cleared when it grows past cacheLimit
+    products = {} # {(Dimension, Dimension): Dimension}
+    quotients = {} # {(Dimension, Dimension): Dimension}
+    powers = {} # {(Dimension, Number): Dimension}
+    cacheLimit = 4096
+    
+    def __new__(cls, length=0, mass=0, time=0, current=0, temperature=0, amountOfSubstance=0, luminousIntensity=0, angle=0):
+        return Dimension.fromExponents((length, mass, time, current, temperature, amountOfSubstance, luminousIntensity, angle))
+    
+    @staticmethod
+    def fromExponents(exponents):
+        """
+        fromExponents :: Iterable Number -> Dimension
+        takes the powers of each base dimension, in the order of Dimension.names
+        returns the interned dimension with those powers
+        """
+        exponents = tuple(map(canonicalExponent, exponents)) # so that 2 and 2.0 intern together
+        dimension = Dimension.instances.get(exponents)
+        if dimension is None:
+            with Dimension.instancesLock:
+                dimension = Dimension.instances.get(exponents)
+                if dimension is None:
+                    dimension = object.__new__(Dimension)
+                    object.__setattr__(dimension, "exponents", exponents)
+                    object.__setattr__(dimension, "strings", {}) # {style: text}, filled by format
+                    Dimension.instances[exponents] = dimension
+        return dimension
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Dimension is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Dimension is immutable")
+    
+    def __reduce__(self):
+        return (Dimension, self.exponents)
     
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        return self is other
+    
+    def __ne__(self, other):
+        return self is not other
+    
+    __hash__ = object.__hash__ # consistent with identity equality because instances are interned
     
     def __add__(self, other):
-        return Dimension(**self.__dict__) if self.__dict__ == other.__dict__ else raiser(ValueError("addition with different units"))
+        return self if self is other else raiser(ValueError("addition with different units"))
     
     def __sub__(self, other):
-        return Dimension(**self.__dict__) if self.__dict__ == other.__dict__ else raiser(ValueError("addition with different units"))
+        return self if self is other else raiser(ValueError("addition with different units"))
     
     def __mul__(self, other):
-        unions = {key: (self.__dict__[key] + other.__dict__[key]) for key in self.__dict__.keys() & other.__dict__.keys()}
-        return Dimension(**{**self.__dict__, **other.__dict__, **unions})
+        key = (self, other)
+        try:
+            return Dimension.products[key]
+        except KeyError:
+            pass
+        result = Dimension.fromExponents(a + b for (a, b) in zip(self.exponents, other.exponents))
+        remember(Dimension.products, key, result)
+        return result
     
     def __truediv__(self, other):
-        unions = {key: (self.__dict__[key] - other.__dict__[key]) for key in self.__dict__.keys() & other.__dict__.keys()}
-        return Dimension(**{**self.__dict__, **other.__dict__, **unions})
-        
+        key = (self, other)
+        try:
+            return Dimension.quotients[key]
+        except KeyError:
+            pass
+        result = Dimension.fromExponents(a - b for (a, b) in zip(self.exponents, other.exponents))
+        remember(Dimension.quotients, key, result)
+        return result
+    
     def __pow__(self, power):
-        return Dimension(**{key: self.__dict__[key] * power for key in self.__dict__.keys()})
+        key = (self, power)
+        try:
+            return Dimension.powers[key]
+        except KeyError:
+            pass
+        result = Dimension.fromExponents(e * power for e in self.exponents)
+        remember(Dimension.powers, key, result)
+        return result
     
     def __repr__(self):
         return self.__str__()
         #return "length^({}) * mass^({}) * time^({}) * current^({}) * temperature^({}) * amountOfSubstance^({}) * luminousIntensity^({}) * angle^({})".format(self.length, self.mass, self.time, self.current, self.temperature, self.amountOfSubstance, self.luminousIntensity, self.angle)
     
     def __str__(self):
-        topKeys = sorted([key for key in self.__dict__.keys() if self.__dict__[key] > 0], key=lambda k: (self.__dict__[k], k))
-        bottomKeys = sorted([key for key in self.__dict__.keys() if self.__dict__[key] < 0], key=lambda k: (self.__dict__[k], k))
-        top = [Dimension.baseUnits[key] + "^" + str(self.__dict__[key]) if self.__dict__[key] != 1 else Dimension.baseUnits[key] for key in topKeys]
-        bottom = [Dimension.baseUnits[key] + "^" + str(-self.__dict__[key]) if self.__dict__[key] != -1 else Dimension.baseUnits[key] for key in bottomKeys]
+        try:
+            return self.strings["plain"]
+        except KeyError:
+            return self.format("plain")
+    
+    def format(self, style="plain"):
+        """
+        format :: String -> String
+        returns the dimension in base units, rendered once per style:
+            "plain" -- m*kg/s^2
+            "superscript" -- m*kg/s²
+        """
+        text = self.strings.get(style)
+        if text is None:
+            if style not in Dimension.powerStyles:
+                raise ValueError("unknown dimension style \"{}\"".format(style))
+            text = self.strings[style] = self.render(Dimension.powerStyles[style])
+        return text
+    
+    def render(self, power):
+        powers = dict(zip(Dimension.names, self.exponents))
+        topKeys = sorted([key for key in Dimension.names if powers[key] > 0], key=lambda k: (powers[k], k))
+        bottomKeys = sorted([key for key in Dimension.names if powers[key] < 0], key=lambda k: (powers[k], k))
+        top = [Dimension.baseUnits[key] + power(powers[key]) if powers[key] != 1 else Dimension.baseUnits[key] for key in topKeys]
+        bottom = [Dimension.baseUnits[key] + power(-powers[key]) if powers[key] != -1 else Dimension.baseUnits[key] for key in bottomKeys]
         if not topKeys and not bottomKeys: # if both are empty (only 0's)
             return ""
         elif topKeys and not bottomKeys: # if only positive powers
@@ -52,8 +137,51 @@ class Dimension:
     
     # TODO: make sqrt overloader
 
+# superscripts :: the inverse of unitPowerReplacements in Measure
+superscripts = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+# powerStyles :: {style: (Number -> String)}
+# how each style of Dimension.format writes a power
+Dimension.powerStyles = {
+    "plain": lambda power: "^" + str(power),
+    "superscript": lambda power: str(int(power)).translate(superscripts) if power == int(power) else "^" + str(power),
+    }
+
+# expose each exponent as a read-only attribute (ex: dimension.length)
+for (index, name) in enumerate(Dimension.names):
+    setattr(Dimension, name, property(lambda self, index=index: self.exponents[index]))
+del index, name
+
 ################################################################################
 # UTILITIES
 ################################################################################
 
 def raiser(ex): raise ex
+
+def chunks(iterable, size):
+    """
+    chunks :: Iterable a -> Int -> Iterator [a]
+    yields lists of size items (the last one can be shorter)
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def canonicalExponent(power):
+    """
+    canonicalExponent :: Number -> Number
+    returns whole powers as ints (so they print as "m^2") and others as floats
+    """
+    power = float(power)
+    return int(power) if power.is_integer() else power
+
+def remember(cache, key, value):
+    """
+    stores the value in a memo cache, emptying the cache first if it is full
+    """
+    if len(cache) >= Dimension.cacheLimit:
+        cache.clear()
+    cache[key] = value
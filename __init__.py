@@ -1,2 +1,19 @@
-from Measure import Measure, units
+from Measure import Measure, units, unitCache, reloadUnits, readMeasure
 from Unit import Dimension
+from Converter import Converter
+from Formula import compileFormula
+from Checked import checkUnits, setChecking
+from Serialize import MeasureWriter, dumpMeasures, loadMeasures
+from Display import bestUnit, simplify, MeasureFormatter
+from Accumulator import MeasureAccumulator
+from Registry import UnitRegistry
+from Index import MeasureIndex
+try:
+    from MeasureArray import MeasureArray
+    from Reader import readMeasures
+    from Aggregate import total, mean, percentile, histogram
+    from MeasureFrame import MeasureFrame
+    from Lazy import lazy
+    from MappedArray import MappedMeasureArray
+except ImportError: # numpy is not installed
+    pass
@@ -0,0 +1,163 @@
+"""
+benchmarks for the hot paths of pyUnits
+
+    python benchmarks/benchmark.py                        # print the results
+    python benchmarks/benchmark.py --save baseline.json   # keep them as a baseline
+    python benchmarks/benchmark.py --compare baseline.json  # fail on regressions
+
+timings are the best of several repeats, in nanoseconds per operation
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Measure import Measure, unitCache
+import Snapshot
+
+setup = """
+from Measure import Measure, readUnit, parseUnit
+from Unit import Dimension
+a = Measure(3, "m")
+b = Measure(2, "ft")
+t = Measure(4, "s")
+d = a.dimension
+e = t.dimension
+"""
+
+# (name, statement) pairs timed with the setup above
+cases = [
+    ("readUnit simple", "readUnit('km')"),
+    ("readUnit compound", "readUnit('kg*m^2/s^3*A')"),
+    ("parseUnit simple (uncached)", "parseUnit('km')"),
+    ("parseUnit compound (uncached)", "parseUnit('kg*m^2/s^3*A')"),
+    ("Measure()", "Measure(3, 'km')"),
+    ("Measure.fromBase", "Measure.fromBase(3.0, d)"),
+    ("Measure +", "a + b"),
+    ("Measure -", "a - b"),
+    ("Measure * Measure", "a * t"),
+    ("Measure * number", "a * 2"),
+    ("Measure / Measure", "a / t"),
+    ("Measure / number", "a / 2"),
+    ("number / Measure", "2 / a"),
+    ("Measure **", "a ** 2"),
+    ("Measure -x", "-a"),
+    ("Measure <", "a < b"),
+    ("Measure ==", "a == b"),
+    ("Measure[unit]", "a['ft']"),
+    ("Measure[compound unit]", "(a / t)['km/hr']"),
+    ("Dimension *", "d * e"),
+    ("Dimension /", "d / e"),
+    ("Dimension **", "d ** 2"),
+    ("Dimension str", "str(d / e)"),
+]
+
+def timeCase(statement, repeat):
+    """
+    timeCase :: String -> Int -> Number
+    returns the best time in nanoseconds to run the statement once
+    """
+    timer = timeit.Timer(statement, setup)
+    (number, _) = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+def memoryPerObject(make, count):
+    """
+    memoryPerObject :: (Int -> a) -> Int -> Number
+    returns the bytes allocated per object when making count of them
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = make(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+def run(repeat, count):
+    """
+    run :: Int -> Int -> {String: a}
+    runs every benchmark and returns the machine-readable results
+    """
+    results = {name: timeCase(statement, repeat) for (name, statement) in cases}
+    unitCache.clear()
+    memory = {
+        "Measure (same unit)": memoryPerObject(lambda n: [Measure(float(i), "km") for i in range(n)], count),
+        "Measure (derived)": memoryPerObject(lambda n: [Measure(float(i), "m") / Measure(2, "s") for i in range(n)], count),
+    }
+    try:
+        from MeasureArray import MeasureArray
+    except ImportError: # numpy is not installed
+        pass
+    else:
+        memory["MeasureArray element"] = memoryPerObject(lambda n: MeasureArray(range(n), "km"), count)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timings": results, # ns per operation
+        "memory": memory, # bytes per object
+        "import": Snapshot.importTime() * 1e9, # ns for a cold "import Measure"
+    }
+
+def flatten(results):
+    """
+    flatten :: {String: a} -> {String: Number}
+    returns every measured number under one name
+    """
+    flat = {"time: " + name: value for (name, value) in results["timings"].items()}
+    flat.update({"memory: " + name: value for (name, value) in results["memory"].items()})
+    flat["import"] = results["import"]
+    return flat
+
+def compare(results, baseline, threshold):
+    """
+    compare :: {String: a} -> {String: a} -> Number -> [String]
+    prints the change of each number against the baseline
+    returns the names that got worse by more than threshold (a fraction)
+    """
+    (new, old) = (flatten(results), flatten(baseline))
+    regressions = []
+    for (name, value) in new.items():
+        if name not in old:
+            print("{:40} {:>12.1f}  (new)".format(name, value))
+            continue
+        change = value/old[name] - 1 if old[name] else 0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print("{:40} {:>12.1f} {:>+8.1%}{}".format(name, value, change, flag))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the hot paths of pyUnits")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats, the best is kept")
+    parser.add_argument("--count", type=int, default=100000, help="objects made for the memory benchmarks")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown counted as a regression (default 0.10)")
+    args = parser.parse_args()
+    results = run(args.repeat, args.count)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=4)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("{} regression(s) over {:.0%}".format(len(regressions), args.threshold))
+            sys.exit(1)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        print()
+
+if __name__ == "__main__":
+    main()